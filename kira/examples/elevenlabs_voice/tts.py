@@ -5,7 +5,7 @@ This example shows how to swap the default Piper TTS for ElevenLabs
 cloud-based TTS with high-quality voices.
 
 To use this:
-1. pip install elevenlabs
+1. pip install elevenlabs sounddevice
 2. Set ELEVENLABS_API_KEY environment variable
 3. Replace the import in voice/output.py:
    - from tts.piper import PiperTTS
@@ -16,8 +16,6 @@ Or create a new voice output that uses this TTS directly.
 
 import os
 import sys
-import tempfile
-import subprocess
 import threading
 import queue
 from typing import Optional
@@ -40,6 +38,10 @@ class ElevenLabsTTS:
     # Default to a good conversational voice
     DEFAULT_VOICE = "Rachel"  # Or use voice_id for custom voices
 
+    # Raw 16-bit mono PCM, played as it streams in without decoding
+    OUTPUT_FORMAT = "pcm_22050"
+    SAMPLE_RATE = 22050
+
     def __init__(self, voice: str = DEFAULT_VOICE, api_key: Optional[str] = None):
         self.voice = voice
         self.api_key = api_key or os.environ.get("ELEVENLABS_API_KEY")
@@ -51,11 +53,13 @@ class ElevenLabsTTS:
             )
 
         self._client = None
-        self._audio_queue: queue.Queue = queue.Queue()
+        self._text_queue: queue.Queue = queue.Queue()
         self._playback_thread: Optional[threading.Thread] = None
-        self._playback_process: Optional[subprocess.Popen] = None
-        self._playback_lock = threading.Lock()
-        self._interrupted = False
+        self._stream = None  # sounddevice RawOutputStream, opened lazily
+        self._playback_lock = threading.Lock()  # Guards the stream
+        self._speak_lock = threading.Lock()  # One utterance at a time
+        self._generation = 0  # Bumped by interrupt() to cancel queued speech
+        self._speaking = False
 
     def _get_client(self):
         """Lazy-load ElevenLabs client."""
@@ -70,69 +74,40 @@ class ElevenLabsTTS:
                 )
         return self._client
 
-    def speak(self, text: str, blocking: bool = True) -> Optional[str]:
+    def speak(self, text: str, blocking: bool = True) -> None:
         """
         Convert text to speech and play it.
 
+        Audio is played in-process as it streams from the API, so playback
+        starts with the first chunk and no player process is spawned.
+
         Args:
             text: Text to speak
-            blocking: If True, wait for audio to finish
-
-        Returns:
-            Path to generated audio file (if not blocking)
+            blocking: If True, wait for audio to finish; otherwise queue it
         """
         if not text or not text.strip():
-            return None
-
-        self._interrupted = False
-
-        try:
-            client = self._get_client()
-
-            # Generate audio
-            audio = client.generate(
-                text=text,
-                voice=self.voice,
-                model="eleven_turbo_v2",  # Faster model, good for real-time
-            )
-
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                for chunk in audio:
-                    f.write(chunk)
-                audio_path = f.name
-
-            if blocking:
-                self._play_audio(audio_path)
-                return None
-            else:
-                self._audio_queue.put(audio_path)
-                self._ensure_playback_thread()
-                return audio_path
+            return
 
-        except Exception as e:
-            print(f"ElevenLabs TTS error: {e}", file=sys.stderr)
-            return None
+        if blocking:
+            self._speak(text, self._generation)
+        else:
+            self._text_queue.put((text, self._generation))
+            self._ensure_playback_thread()
 
     def interrupt(self):
         """Stop current playback immediately."""
-        self._interrupted = True
-
         with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
+            self._generation += 1
+            if self._stream is not None and self._stream.active:
                 try:
-                    self._playback_process.terminate()
-                    self._playback_process.wait(timeout=0.5)
+                    self._stream.abort()
                 except Exception:
-                    try:
-                        self._playback_process.kill()
-                    except Exception:
-                        pass
+                    pass
 
         # Clear queue
-        while not self._audio_queue.empty():
+        while not self._text_queue.empty():
             try:
-                self._audio_queue.get_nowait()
+                self._text_queue.get_nowait()
             except queue.Empty:
                 break
 
@@ -140,34 +115,69 @@ class ElevenLabsTTS:
 
     def is_speaking(self) -> bool:
         """Check if currently speaking."""
+        return self._speaking or not self._text_queue.empty()
+
+    def close(self):
+        """Stop playback, end the playback thread and release the output stream."""
+        self.interrupt()
+        if self._playback_thread is not None:
+            self._text_queue.put(None)
         with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
-                return True
-        return not self._audio_queue.empty()
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    def _speak(self, text: str, generation: int):
+        """Generate speech for text and play it as it arrives, unless interrupted."""
+        with self._speak_lock:
+            if self._generation != generation:
+                return
+            self._speaking = True
+            try:
+                client = self._get_client()
+
+                # Generate audio
+                audio = client.generate(
+                    text=text,
+                    voice=self.voice,
+                    model="eleven_turbo_v2",  # Faster model, good for real-time
+                    output_format=self.OUTPUT_FORMAT,
+                )
 
-    def _play_audio(self, path: str):
-        """Play audio file."""
-        if self._interrupted:
-            return
+                stream = None
+                carry = b""  # Network chunks can split a 2-byte sample
+                for chunk in audio:
+                    if self._generation != generation:
+                        return
+                    data = carry + chunk
+                    end = len(data) - len(data) % 2
+                    data, carry = data[:end], data[end:]
+                    if data:
+                        stream = self._get_stream()
+                        stream.write(data)
+
+                # stop() returns once the buffered audio has been played
+                if stream is not None and self._generation == generation:
+                    stream.stop()
 
+            except Exception as e:
+                if self._generation == generation:
+                    print(f"ElevenLabs TTS error: {e}", file=sys.stderr)
+            finally:
+                self._speaking = False
+
+    def _get_stream(self):
+        """Return the started output stream, opening it on first use."""
         with self._playback_lock:
-            # macOS: use afplay (works with mp3)
-            self._playback_process = subprocess.Popen(
-                ["afplay", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            if self._stream is None:
+                import sounddevice as sd
 
-        try:
-            self._playback_process.wait()
-        except Exception:
-            pass
-        finally:
-            with self._playback_lock:
-                self._playback_process = None
-            # Clean up temp file
-            try:
-                os.unlink(path)
-            except Exception:
-                pass
+                self._stream = sd.RawOutputStream(
+                    samplerate=self.SAMPLE_RATE, channels=1, dtype="int16"
+                )
+            if not self._stream.active:
+                self._stream.start()
+            return self._stream
 
     def _ensure_playback_thread(self):
         """Ensure background playback thread is running."""
@@ -180,12 +190,13 @@ class ElevenLabsTTS:
     def _playback_loop(self):
         """Background thread for non-blocking playback."""
         while True:
+            # Sleeps until there's something to say; None is close()'s
+            # signal to exit
+            item = self._text_queue.get()
+            if item is None:
+                return
             try:
-                audio_path = self._audio_queue.get(timeout=1.0)
-                if not self._interrupted:
-                    self._play_audio(audio_path)
-            except queue.Empty:
-                continue
+                self._speak(*item)
             except Exception as e:
                 print(f"Playback error: {e}", file=sys.stderr)
 
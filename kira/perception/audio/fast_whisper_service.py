@@ -6,6 +6,8 @@ Uses int8 quantization for additional speedup on CPU.
 """
 
 import sys
+import os
+import re
 import numpy as np
 import threading
 import queue
@@ -25,9 +27,18 @@ else:
 _model = None
 _model_lock = threading.Lock()
 
+# CTranslate2 defaults to 4 threads whatever the machine; use half the cores
+# (leaving the rest to VAD and vision), at least one
+CPU_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
 
 def get_model(model_size: str = "base"):
-    """Lazy load faster-whisper model."""
+    """
+    Lazy load faster-whisper model.
+    
+    model_size is any faster-whisper model name, including the English-only
+    Distil-Whisper conversions such as "distil-small.en".
+    """
     global _model
     if _model is None:
         with _model_lock:
@@ -36,7 +47,13 @@ def get_model(model_size: str = "base"):
                 from faster_whisper import WhisperModel
 
                 # Use int8 for speed on CPU
-                _model = WhisperModel(model_size, device="cpu", compute_type="int8")
+                _model = WhisperModel(
+                    model_size,
+                    device="cpu",
+                    compute_type="int8",
+                    cpu_threads=CPU_THREADS,
+                    num_workers=1,
+                )
                 print(f"faster-whisper {model_size} loaded", file=sys.stderr)
     return _model
 
@@ -65,38 +82,51 @@ HALLUCINATION_PATTERNS = [
 ]
 
 
+# Compiled once: exact matches, substrings for the longer patterns, and the
+# shapes of junk output
+_HALLUCINATION_SET = frozenset(HALLUCINATION_PATTERNS)
+_HALLUCINATION_RE = re.compile(
+    "|".join(re.escape(p) for p in HALLUCINATION_PATTERNS if len(p) > 5)
+)
+_PUNCTUATION_ONLY_RE = re.compile(r"^[\s\.\,\!\?\-]+$")
+_REPEATED_WORD_RE = re.compile(r"\b(\w+)(?:\s+\1){2,}\b")
+_REPEATED_LETTER_RE = re.compile(r"^(\w)(?:\s+\1)+\s*$")
+_REPEATED_CHARS_RE = re.compile(r"(.{1,3})\1{3,}")
+
+
 def is_hallucination(text: str) -> bool:
     """Detect common Whisper hallucinations."""
-    import re
-
-    text = text.strip().lower()
+    text = text.strip()
 
     # Too short
     if len(text) < 3:
         return True
 
+    # Known hallucination phrases: exact matches ("you", "the") are the most
+    # common case, so they're checked first
+    text = text.lower()
+    if text in _HALLUCINATION_SET:
+        return True
+
     # Just punctuation
-    if re.match(r"^[\s\.\,\!\?\-]+$", text):
+    if _PUNCTUATION_ONLY_RE.match(text):
         return True
 
-    # Known hallucination phrases
-    for pattern in HALLUCINATION_PATTERNS:
-        if text == pattern:  # Exact match only for short patterns
-            return True
-        if len(pattern) > 5 and pattern in text:  # Substring match for longer patterns
-            return True
+    # Substring match for longer patterns
+    if _HALLUCINATION_RE.search(text):
+        return True
 
     # Repetitive patterns like "u u u u" or "the the the"
     # Match: word repeated 3+ times with spaces
-    if re.search(r"\b(\w+)(?:\s+\1){2,}\b", text):
+    if _REPEATED_WORD_RE.search(text):
         return True
 
     # Single character repeated with spaces: "u u u u"
-    if re.match(r"^(\w)(?:\s+\1)+\s*$", text):
+    if _REPEATED_LETTER_RE.match(text):
         return True
 
     # Character/pattern repeated many times: "uuuuuu" or "hahaha"
-    if re.search(r"(.{1,3})\1{3,}", text):
+    if _REPEATED_CHARS_RE.search(text):
         return True
 
     return False
@@ -111,6 +141,11 @@ class FastWhisperTranscriber:
 
     # Keywords that indicate user wants attention - triggers interrupt AND transcription
     INTERRUPT_KEYWORDS = ["kira", "stop", "wait", "quiet"]
+    # Whole-word, case-insensitive match compiled once; avoids lowercasing
+    # every transcription and scanning it once per keyword
+    _INTERRUPT_RE = re.compile(
+        r"\b(?:" + "|".join(INTERRUPT_KEYWORDS) + r")\b", re.IGNORECASE
+    )
 
     def __init__(
         self,
@@ -205,8 +240,7 @@ class FastWhisperTranscriber:
 
     def _is_interrupt(self, text: str) -> bool:
         """Check if text contains interrupt keyword."""
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in self.INTERRUPT_KEYWORDS)
+        return self._INTERRUPT_RE.search(text) is not None
 
     def mute(self):
         """Mute transcriptions (still detect interrupts)."""
@@ -236,7 +270,7 @@ class FastWhisperTranscriber:
             def audio_callback(indata, frames, time_info, status):
                 if status:
                     print(f"Audio status: {status}", file=sys.stderr)
-                self._audio_queue.put(indata.copy().flatten())
+                self._audio_queue.put(indata[:, 0].copy())
 
             self._stream = sd.InputStream(
                 samplerate=SAMPLE_RATE,
@@ -8,7 +8,7 @@ Silero VAD runs on CPU in ~1ms, avoiding wasted Whisper inference on silence.
 import sys
 import numpy as np
 from dataclasses import dataclass
-from typing import Optional, Callable, List
+from typing import Optional, Callable
 import threading
 import queue
 import time
@@ -21,6 +21,7 @@ _model_lock = threading.Lock()
 SAMPLE_RATE = 16000
 CHUNK_MS = 32  # Silero works best with 32ms chunks
 CHUNK_SAMPLES = int(SAMPLE_RATE * CHUNK_MS / 1000)  # 512 samples
+MAX_SPEECH_SECONDS = 30  # Longest segment we buffer (Whisper's window size)
 
 
 def get_vad_model():
@@ -85,12 +86,19 @@ class SileroVAD:
         self.speech_pad_samples = int(SAMPLE_RATE * speech_pad_ms / 1000)
         self.on_speech_segment = on_speech_segment
         
-        self._speech_buffer: List[np.ndarray] = []
+        # Preallocated once; chunks are written at _buffered_samples
+        self._speech_buffer = np.zeros(SAMPLE_RATE * MAX_SPEECH_SECONDS, dtype=np.float32)
+        self._buffered_samples = 0
         self._silence_samples = 0
         self._speech_samples = 0
         self._in_speech = False
         self._speech_start_time = None
         
+        # Resolved on the first chunk, so later chunks skip the torch import
+        # and get_vad_model()'s lazy-load check
+        self._model = None
+        self._from_numpy = None
+        
     def process_chunk(self, audio_chunk: np.ndarray) -> Optional[float]:
         """
         Process an audio chunk through VAD.
@@ -101,23 +109,29 @@ class SileroVAD:
         Returns:
             Speech probability (0-1) or None if chunk too small
         """
-        import torch
-        
-        model, _ = get_vad_model()
+        if self._model is None:
+            import torch
+            
+            self._from_numpy = torch.from_numpy
+            self._model, _ = get_vad_model()
         
         # Ensure correct shape and type
         if len(audio_chunk) < CHUNK_SAMPLES:
             return None
             
         # Convert to tensor
-        audio_tensor = torch.from_numpy(audio_chunk[:CHUNK_SAMPLES].astype(np.float32))
+        audio_tensor = self._from_numpy(audio_chunk[:CHUNK_SAMPLES].astype(np.float32))
         
         # Get speech probability
-        speech_prob = model(audio_tensor, SAMPLE_RATE).item()
+        speech_prob = self._model(audio_tensor, SAMPLE_RATE).item()
         
         # Update state
         is_speech = speech_prob >= self.threshold
         
+        # Flush before the buffer overflows
+        if self._in_speech and self._buffered_samples + len(audio_chunk) > len(self._speech_buffer):
+            self._emit_segment()
+        
         if is_speech:
             if not self._in_speech:
                 self._in_speech = True
@@ -125,13 +139,13 @@ class SileroVAD:
                 self._speech_samples = 0
                 self._silence_samples = 0
             
-            self._speech_buffer.append(audio_chunk.copy())
+            self._buffer_audio(audio_chunk)
             self._speech_samples += len(audio_chunk)
             self._silence_samples = 0
             
         else:  # Silence
             if self._in_speech:
-                self._speech_buffer.append(audio_chunk.copy())
+                self._buffer_audio(audio_chunk)
                 self._silence_samples += len(audio_chunk)
                 
                 # Check if we've had enough silence to end the segment
@@ -140,11 +154,17 @@ class SileroVAD:
         
         return speech_prob
     
+    def _buffer_audio(self, audio_chunk: np.ndarray):
+        """Append a chunk to the preallocated speech buffer."""
+        end = self._buffered_samples + len(audio_chunk)
+        self._speech_buffer[self._buffered_samples:end] = audio_chunk
+        self._buffered_samples = end
+    
     def _emit_segment(self):
         """Emit the current speech segment if valid."""
-        if self._speech_samples >= self.min_speech_samples and self._speech_buffer:
-            # Concatenate all buffered audio
-            audio = np.concatenate(self._speech_buffer)
+        if self._speech_samples >= self.min_speech_samples and self._buffered_samples:
+            # Copy out of the buffer, which is reused for the next segment
+            audio = self._speech_buffer[:self._buffered_samples].copy()
             
             segment = SpeechSegment(
                 audio=audio,
@@ -157,7 +177,7 @@ class SileroVAD:
                 self.on_speech_segment(segment)
         
         # Reset state
-        self._speech_buffer = []
+        self._buffered_samples = 0
         self._speech_samples = 0
         self._silence_samples = 0
         self._in_speech = False
@@ -165,7 +185,7 @@ class SileroVAD:
     
     def reset(self):
         """Reset VAD state."""
-        self._speech_buffer = []
+        self._buffered_samples = 0
         self._speech_samples = 0
         self._silence_samples = 0
         self._in_speech = False
@@ -183,10 +203,21 @@ class VADTranscriptionPipeline:
         self,
         whisper_model: str = "base",
         vad_threshold: float = 0.5,
-        on_transcription: Optional[Callable] = None
+        on_transcription: Optional[Callable] = None,
+        model_loader: Optional[Callable] = None
     ):
+        """
+        Args:
+            whisper_model: Whisper model name
+            vad_threshold: Speech probability threshold (0-1)
+            on_transcription: Callback with the transcription dict
+            model_loader: Optional shared loader (e.g. whisper_service.get_model)
+                so the pipeline reuses an already-loaded model instead of
+                loading its own copy
+        """
         self.whisper_model_name = whisper_model
         self._whisper_model = None
+        self._model_loader = model_loader
         self.on_transcription = on_transcription
         
         self.vad = SileroVAD(
@@ -199,6 +230,8 @@ class VADTranscriptionPipeline:
         
     def _get_whisper(self):
         """Lazy load Whisper model."""
+        if self._whisper_model is None and self._model_loader is not None:
+            self._whisper_model = self._model_loader(self.whisper_model_name)
         if self._whisper_model is None:
             print(f"Loading Whisper {self.whisper_model_name}...", file=sys.stderr)
             import whisper
@@ -251,7 +284,7 @@ class VADTranscriptionPipeline:
             def audio_callback(indata, frames, time_info, status):
                 if status:
                     print(f"Audio status: {status}", file=sys.stderr)
-                self._audio_queue.put(indata.copy().flatten())
+                self._audio_queue.put(indata[:, 0].copy())
             
             # Start audio stream
             self._stream = sd.InputStream(
@@ -6,6 +6,7 @@ Only runs Whisper on detected speech segments, avoiding wasted inference on sile
 """
 
 import sys
+import os
 import json
 import numpy as np
 import threading
@@ -36,6 +37,15 @@ def get_model(model_name: str = "base"):
                 print(f"Loading Whisper model ({model_name})...", file=sys.stderr)
                 import whisper
                 _model = whisper.load_model(model_name)
+                
+                # Optional int8 dynamic quantization for CPU runs (MPS has no qint8 kernels)
+                if os.getenv("KIRA_QUANTIZE") == "1" and next(_model.parameters()).device.type == "cpu":
+                    import torch
+                    _model = torch.ao.quantization.quantize_dynamic(
+                        _model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    print("Whisper quantized to int8", file=sys.stderr)
+                
                 print("Whisper loaded", file=sys.stderr)
     return _model
 
@@ -117,7 +127,8 @@ class WhisperTranscriber:
         self._pipeline = VADTranscriptionPipeline(
             whisper_model=model_name,
             vad_threshold=vad_threshold,
-            on_transcription=self._handle_transcription
+            on_transcription=self._handle_transcription,
+            model_loader=get_model  # Share the process-wide model
         )
         self._running = False
     
@@ -290,7 +301,7 @@ class InterruptableTranscriber:
             def audio_callback(indata, frames, time_info, status):
                 if status:
                     print(f"Audio status: {status}", file=sys.stderr)
-                self._audio_queue.put(indata.copy().flatten())
+                self._audio_queue.put(indata[:, 0].copy())
             
             self._stream = sd.InputStream(
                 samplerate=SAMPLE_RATE,
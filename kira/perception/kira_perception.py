@@ -21,6 +21,11 @@ from dataclasses import dataclass, asdict
 from typing import Optional
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Will be lazily imported
 cv2 = None
 
@@ -36,7 +41,13 @@ class PerceptionEvent:
             self.timestamp = time.time()
 
     def to_json(self) -> str:
-        return json.dumps(asdict(self))
+        payload = asdict(self)
+        if orjson is not None:
+            try:
+                return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            except TypeError:
+                pass  # Something only the json module's encoder handles
+        return json.dumps(payload)
 
 
 class KiraPerception:
@@ -252,6 +263,7 @@ class KiraPerception:
         differ = FrameDifferencer(
             change_threshold=0.05,
             min_frames_between_vlm=15,
+            bgr=True,
         )
 
         frame_count = 0
@@ -303,15 +315,16 @@ class KiraPerception:
                 continue
 
             frame_count += 1
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-            # Check if we should run VLM
-            should_run, diff_result = differ.should_run_vlm(frame_rgb)
+            # Check if we should run VLM (on the BGR frame; most frames stop here)
+            should_run, diff_result = differ.should_run_vlm(frame)
 
             if not should_run:
                 time.sleep(0.033)  # ~30fps capture rate
                 continue
 
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
             vlm_count += 1
 
             try:
@@ -177,12 +177,11 @@ def test_tts() -> TestResult:
             
             t0 = time.time()
             voice = get_voice()
-            audio_bytes = b''
-            for chunk in voice.synthesize(text):
-                audio_bytes += chunk.audio_int16_bytes
+            audio_bytes = b''.join(chunk.audio_int16_bytes for chunk in voice.synthesize(text))
             gen_time = int((time.time() - t0) * 1000)
+            audio_s = len(audio_bytes) / 2 / voice.config.sample_rate  # 16-bit mono
             
-            print_status("TTS", "...", f'Playing audio ({gen_time}ms generation)')
+            print_status("TTS", "...", f'Playing audio ({gen_time}ms generation, {audio_s:.1f}s of audio)')
             
             t0 = time.time()
             tts.speak(text, blocking=True)
@@ -3,12 +3,26 @@ Pytest configuration and shared fixtures for Kira perception tests.
 """
 
 import pytest
+import os
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Let the MPS allocator grow to the system limit instead of failing early
+# when several module-scoped models are loaded over one pytest run.
+# Must be set before torch is first imported.
+os.environ.setdefault("PYTORCH_MPS_HIGH_WATERMARK_RATIO", "0.0")
+
+
+def pytest_addoption(parser):
+    """Add command-line options."""
+    parser.addoption(
+        "--run-benchmarks", action="store_true", default=False,
+        help="run timing benchmarks (skipped by default)"
+    )
+
 
 def pytest_configure(config):
     """Register custom markers."""
@@ -18,10 +32,19 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "slow: marks tests as slow (model loading)"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: marks timing tests (run with --run-benchmarks)"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
-    """Skip integration tests by default unless explicitly requested."""
+    """Skip integration tests and benchmarks by default unless explicitly requested."""
+    if not config.getoption("--run-benchmarks"):
+        skip_benchmark = pytest.mark.skip(reason="use --run-benchmarks to run timing benchmarks")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
+
     if config.getoption("-m"):
         # User specified markers, don't modify
         return
@@ -30,3 +53,18 @@ def pytest_collection_modifyitems(config, items):
     for item in items:
         if "integration" in item.keywords:
             item.add_marker(skip_integration)
+
+
+@pytest.fixture(scope="class")
+def _class_perception():
+    """One model-free KiraPerception shared by every test in a class."""
+    from kira_perception import KiraPerception
+    yield KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
+
+
+@pytest.fixture
+def perception(_class_perception):
+    """Shared KiraPerception whose event queue is drained after each test."""
+    yield _class_perception
+    while not _class_perception._event_queue.empty():
+        _class_perception._event_queue.get_nowait()
@@ -9,17 +9,37 @@ Run with: uv run pytest tests/integration/test_moondream_integration.py -v -s
 
 import pytest
 import numpy as np
+import gc
 import sys
+import time
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 
 @pytest.fixture(scope="module")
-def vlm():
+def vlm(request):
     """Load Moondream VLM once for all tests in this module."""
-    from vlm.moondream_service import MoondreamVLM
-    return MoondreamVLM()
+    import torch
+    from vlm import moondream_service
+    
+    vlm = moondream_service.MoondreamVLM()
+    
+    # Dummy pass so the first test doesn't pay model load + kernel warmup
+    t0 = time.time()
+    vlm.describe(np.zeros((480, 640, 3), dtype=np.uint8))
+    if request.config.getoption("verbose") > 0:
+        print(f"\n[Moondream warmup: {(time.time() - t0) * 1000:.0f}ms]")
+    
+    yield vlm
+    
+    # Drop every reference so the next module starts with a clean MPS pool
+    del vlm
+    moondream_service._model = None
+    moondream_service._tokenizer = None
+    gc.collect()
+    if torch.backends.mps.is_available():
+        torch.mps.empty_cache()
 
 
 @pytest.fixture
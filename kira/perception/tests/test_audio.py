@@ -27,14 +27,14 @@ class TestSileroVAD:
         from audio.vad import SileroVAD
 
         vad = SileroVAD()
-        vad._speech_buffer = [np.zeros(512)]
+        vad._buffer_audio(np.zeros(512, dtype=np.float32))
         vad._speech_samples = 1000
         vad._silence_samples = 500
         vad._in_speech = True
 
         vad.reset()
 
-        assert vad._speech_buffer == []
+        assert vad._buffered_samples == 0
         assert vad._speech_samples == 0
         assert vad._silence_samples == 0
         assert not vad._in_speech
@@ -47,7 +47,8 @@ class TestSileroVAD:
         vad = SileroVAD(on_speech_segment=callback)
 
         # Simulate speech followed by silence
-        vad._speech_buffer = [np.zeros(512) for _ in range(20)]
+        for _ in range(20):
+            vad._buffer_audio(np.zeros(512, dtype=np.float32))
         vad._speech_samples = 10240  # More than min_speech_samples
         vad._in_speech = True
         vad._speech_start_time = 1.0
@@ -57,6 +58,25 @@ class TestSileroVAD:
         callback.assert_called_once()
         segment = callback.call_args[0][0]
         assert isinstance(segment, SpeechSegment)
+        assert len(segment.audio) == 20 * 512
+
+
+class TestVoiceActivityDetector:
+    """Test legacy energy-based VAD."""
+
+    def test_process_reports_speech_start_then_speech(self):
+        """A loud chunk starts speech; quiet audio before it is silence."""
+        from audio.whisper_service import VoiceActivityDetector
+
+        vad = VoiceActivityDetector(threshold=0.01)
+        quiet = np.zeros(4000, dtype=np.float32)
+        loud = np.full(4000, 0.5, dtype=np.float32)
+
+        assert vad.process(quiet) == 'silence'
+        assert vad.process(loud) == 'speech_start'
+        assert vad.process(loud) == 'speech'
+        # A short pause is still part of the utterance
+        assert vad.process(quiet) == 'speech'
 
 
 class TestFastWhisperTranscriber:
@@ -78,13 +98,13 @@ class TestFastWhisperTranscriber:
         from audio.fast_whisper_service import FastWhisperTranscriber
 
         transcriber = FastWhisperTranscriber()
-        transcriber.vad._speech_buffer = [np.zeros(512)]
+        transcriber.vad._buffer_audio(np.zeros(512, dtype=np.float32))
         transcriber.vad._in_speech = True
 
         transcriber.mute()
 
         assert transcriber._muted
-        assert transcriber.vad._speech_buffer == []
+        assert transcriber.vad._buffered_samples == 0
         assert not transcriber.vad._in_speech
 
     @patch('audio.fast_whisper_service.get_model')
@@ -94,12 +114,12 @@ class TestFastWhisperTranscriber:
 
         transcriber = FastWhisperTranscriber()
         transcriber._muted = True
-        transcriber.vad._speech_buffer = [np.zeros(512)]
+        transcriber.vad._buffer_audio(np.zeros(512, dtype=np.float32))
 
         transcriber.unmute()
 
         assert not transcriber._muted
-        assert transcriber.vad._speech_buffer == []
+        assert transcriber.vad._buffered_samples == 0
 
     @patch('audio.fast_whisper_service.get_model')
     def test_muted_transcriber_skips_regular_transcription(self, mock_get_model):
@@ -168,6 +188,8 @@ class TestFastWhisperTranscriber:
         assert transcriber._is_interrupt("QUIET please")
         assert not transcriber._is_interrupt("Hello there")
         assert not transcriber._is_interrupt("How are you?")
+        # Keywords only match as whole words
+        assert not transcriber._is_interrupt("I was waiting for the bus")
 
 
 class TestEchoCancellationManager:
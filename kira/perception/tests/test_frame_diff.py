@@ -0,0 +1,153 @@
+"""Tests for frame differencing used to trigger the VLM."""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vlm.frame_diff import FrameDifferencer, perceptual_hash
+
+
+def _frame(value: int, shape=(480, 640, 3)) -> np.ndarray:
+    return np.full(shape, value, dtype=np.uint8)
+
+
+class TestDownsample:
+    """Test the downsampling applied before comparison."""
+
+    def test_downsample_matches_block_mean(self):
+        """Each output pixel should be the (rounded) mean of its block."""
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (481, 643, 3), dtype=np.uint8)
+        differ = FrameDifferencer(downsample_factor=4)
+
+        small = differ._downsample(frame)
+
+        expected = frame[:480, :640].reshape(120, 4, 160, 4, 3).mean(axis=(1, 3))
+        assert small.shape == (120, 160, 3)
+        assert small.dtype == np.uint8
+        assert np.abs(small - expected).max() <= 0.5
+
+    def test_downsample_factor_one_is_identity(self):
+        """No downsampling should hand back the frame unchanged."""
+        frame = _frame(7, (4, 4, 3))
+        differ = FrameDifferencer(downsample_factor=1)
+
+        assert differ._downsample(frame) is frame
+
+    def test_opencl_path_matches_cpu(self):
+        """The UMat path (CPU fallback without a device) should give the same grayscale."""
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (481, 643, 3), dtype=np.uint8)
+        cpu = FrameDifferencer()
+        ocl = FrameDifferencer()
+        ocl._use_opencl = True
+
+        cpu.should_run_vlm(frame)
+        ocl.should_run_vlm(frame)
+
+        diff = cpu._last_vlm_frame_gray.astype(int) - ocl._last_vlm_frame_gray
+        assert np.abs(diff).max() <= 1
+
+    def test_bgr_frames_match_rgb(self):
+        """bgr=True on a BGR frame should see the same grayscale as RGB input."""
+        rng = np.random.default_rng(0)
+        rgb = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+        bgr = np.ascontiguousarray(rgb[..., ::-1])
+        from_rgb = FrameDifferencer()
+        from_bgr = FrameDifferencer(bgr=True)
+
+        from_rgb.should_run_vlm(rgb)
+        from_bgr.should_run_vlm(bgr)
+
+        assert np.array_equal(from_rgb._last_vlm_frame_gray, from_bgr._last_vlm_frame_gray)
+
+
+class TestShouldRunVLM:
+    """Test the VLM trigger decision."""
+
+    def test_first_frame_triggers(self):
+        """The first frame always runs the VLM."""
+        differ = FrameDifferencer()
+
+        should_run, result = differ.should_run_vlm(_frame(0))
+
+        assert should_run
+        assert result.diff_score == 1.0
+
+    def test_static_scene_does_not_trigger(self):
+        """Identical frames should never re-run the VLM."""
+        differ = FrameDifferencer(min_frames_between_vlm=1)
+        differ.should_run_vlm(_frame(100))
+
+        for _ in range(10):
+            should_run, result = differ.should_run_vlm(_frame(100))
+            assert not should_run
+            assert result.diff_score == 0.0
+
+    def test_scene_change_triggers(self):
+        """A large global change should run the VLM immediately."""
+        differ = FrameDifferencer(change_threshold=0.05, min_frames_between_vlm=100)
+        differ.should_run_vlm(_frame(0))
+
+        should_run, result = differ.should_run_vlm(_frame(128))
+
+        assert should_run
+        assert result.diff_score == pytest.approx(128 / 255)
+
+    def test_motion_regions_counted_per_grid_cell(self):
+        """Motion confined to a few grid cells should count those cells only."""
+        differ = FrameDifferencer(downsample_factor=1)
+        diff = np.zeros((64, 80), dtype=np.uint8)
+        diff[:8, :10] = 255  # Whole cell (0, 0)
+        diff[8:16, 10:12] = 255  # 20% of cell (1, 1)
+        diff[56:57, 70:71] = 255  # Single pixel of cell (7, 7)
+
+        assert differ._count_motion_regions(diff) == 2
+
+    def test_caller_may_reuse_frame_buffer(self):
+        """Overwriting the frame after the call must not change stored state."""
+        differ = FrameDifferencer(downsample_factor=1)
+        frame = _frame(0)
+        differ.should_run_vlm(frame)
+
+        frame[:] = 200
+        should_run, result = differ.should_run_vlm(_frame(0))
+
+        assert not should_run
+        assert result.diff_score == 0.0
+
+    def test_frame_size_change_triggers(self):
+        """A new frame size can't be diffed against the old reference, so it triggers."""
+        differ = FrameDifferencer(min_frames_between_vlm=100)
+        differ.should_run_vlm(_frame(0))
+
+        should_run, result = differ.should_run_vlm(_frame(0, (240, 320, 3)))
+
+        assert should_run
+        assert result.diff_score == 1.0
+
+
+class TestPerceptualHash:
+    """Test the dHash used to key the Moondream description cache."""
+
+    def test_hash_ignores_sensor_noise(self):
+        """Small per-pixel noise should leave the hash (nearly) unchanged."""
+        rng = np.random.default_rng(0)
+        frame = np.tile(np.linspace(0, 255, 640, dtype=np.uint8), (480, 1))
+        frame = np.dstack([frame] * 3)
+        noisy = np.clip(frame + rng.integers(-3, 4, frame.shape), 0, 255).astype(np.uint8)
+
+        distance = (perceptual_hash(frame) ^ perceptual_hash(noisy)).bit_count()
+
+        assert distance <= 2
+
+    def test_hash_separates_different_scenes(self):
+        """Mirrored gradients should be far apart in Hamming distance."""
+        frame = np.dstack([np.tile(np.linspace(0, 255, 640, dtype=np.uint8), (480, 1))] * 3)
+
+        distance = (perceptual_hash(frame) ^ perceptual_hash(frame[:, ::-1])).bit_count()
+
+        assert distance > 32
@@ -2,13 +2,38 @@
 
 import pytest
 import numpy as np
-from unittest.mock import Mock, patch
+import os
+import sys
+import types
+from unittest.mock import MagicMock, Mock, patch
+
+from perception.config import CameraConfig, ModelConfig, PerceptionConfig
+from perception.inference import (
+    Detection,
+    InferenceResult,
+    PerceptionModels,
+    POSE_KEYPOINTS,
+)
+
+
+@pytest.fixture(scope="module")
+def _yolo_patch():
+    """Stand in a fake ultralytics module so the real package is never imported."""
+    fake_ultralytics = types.ModuleType('ultralytics')
+    fake_ultralytics.YOLO = MagicMock()
+    with patch.dict(sys.modules, {'ultralytics': fake_ultralytics}):
+        yield fake_ultralytics.YOLO
+
+
+@pytest.fixture
+def mock_yolo(_yolo_patch):
+    """Module-wide YOLO mock, reset so call counts start at zero per test."""
+    _yolo_patch.reset_mock(return_value=True, side_effect=True)
+    return _yolo_patch
 
 
 def test_detection_dataclass():
     """Test Detection dataclass creation."""
-    from perception.inference import Detection
-    
     det = Detection(
         class_id=0,
         class_name='person',
@@ -24,8 +49,6 @@ def test_detection_dataclass():
 
 def test_inference_result_dataclass():
     """Test InferenceResult dataclass."""
-    from perception.inference import InferenceResult, Detection
-    
     result = InferenceResult(
         detections=[
             Detection(0, 'person', [0.1, 0.2, 0.3, 0.4], 0.9)
@@ -40,8 +63,6 @@ def test_inference_result_dataclass():
 
 def test_pose_keypoints():
     """Test POSE_KEYPOINTS constant."""
-    from perception.inference import POSE_KEYPOINTS
-    
     assert 'nose' in POSE_KEYPOINTS
     assert 'left_shoulder' in POSE_KEYPOINTS
     assert 'right_ankle' in POSE_KEYPOINTS
@@ -53,21 +74,14 @@ class TestPerceptionModels:
     
     def test_init_without_load(self):
         """Models should not load on init."""
-        from perception.inference import PerceptionModels
-        from perception.config import ModelConfig
-        
         models = PerceptionModels(ModelConfig())
         
         assert models.detector is None
         assert models.pose_model is None
         assert not models._loaded
     
-    @patch('ultralytics.YOLO')
     def test_load_models(self, mock_yolo):
         """Test model loading."""
-        from perception.inference import PerceptionModels
-        from perception.config import ModelConfig
-        
         models = PerceptionModels(ModelConfig(
             object_detection=True,
             pose_estimation=True
@@ -78,12 +92,8 @@ class TestPerceptionModels:
         assert mock_yolo.call_count == 2
         assert models._loaded
     
-    @patch('ultralytics.YOLO')
     def test_process_returns_result(self, mock_yolo):
         """Test process method returns InferenceResult."""
-        from perception.inference import PerceptionModels, InferenceResult
-        from perception.config import ModelConfig
-        
         mock_detector = Mock()
         mock_detector.return_value = [Mock(boxes=[], names={})]
         mock_yolo.return_value = mock_detector
@@ -105,8 +115,6 @@ class TestConfig:
     
     def test_camera_config_defaults(self):
         """Test CameraConfig defaults."""
-        from perception.config import CameraConfig
-        
         config = CameraConfig()
         
         assert config.device_id == 0
@@ -116,9 +124,6 @@ class TestConfig:
     
     def test_perception_config_from_env(self):
         """Test PerceptionConfig.from_env."""
-        from perception.config import PerceptionConfig
-        import os
-        
         os.environ['KIRA_SOCKET_PATH'] = '/tmp/test.sock'
         
         config = PerceptionConfig.from_env()
@@ -7,90 +7,104 @@ testing timing, echo cancellation effectiveness, and event flow.
 import pytest
 import time
 import threading
-import queue
+import json
 import numpy as np
-import sys
-import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from kira_perception import KiraPerception, PerceptionEvent
+from audio.fast_whisper_service import FastWhisperTranscriber
+from audio.vad import SileroVAD, SpeechSegment, SAMPLE_RATE, CHUNK_SAMPLES
+
+# Read-only silence buffers shared by the tests below
+_SILENCE_CHUNK = np.zeros(CHUNK_SAMPLES, dtype=np.float32)
+_SILENCE_1S = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+
+@pytest.fixture(scope="module")
+def _whisper_patch():
+    """Patch the faster-whisper loader once for the whole module."""
+    with patch('audio.fast_whisper_service.get_model') as mock_get_model:
+        yield mock_get_model
+
+
+@pytest.fixture
+def mock_whisper_model(_whisper_patch):
+    """Module-wide get_model mock, reset so each test configures its own model."""
+    _whisper_patch.reset_mock(return_value=True, side_effect=True)
+    return _whisper_patch
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Worker threads reused by every concurrency test in the module."""
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
 
 
 class TestEchoCancellationIntegration:
     """Test echo cancellation with simulated audio flow."""
 
-    def test_mute_unmute_clears_pending_audio(self):
+    def test_mute_unmute_clears_pending_audio(self, mock_whisper_model):
         """Verify that mute/unmute cycle properly clears VAD buffer."""
-        from audio.fast_whisper_service import FastWhisperTranscriber
-        from unittest.mock import patch
-
         transcriptions = []
 
         def on_transcription(result):
             transcriptions.append(result.text)
 
-        with patch('audio.fast_whisper_service.get_model'):
-            transcriber = FastWhisperTranscriber(on_transcription=on_transcription)
+        transcriber = FastWhisperTranscriber(on_transcription=on_transcription)
 
-            # Simulate audio accumulating in VAD buffer
-            transcriber.vad._speech_buffer = [np.zeros(512, dtype=np.float32) for _ in range(10)]
-            transcriber.vad._speech_samples = 5120
-            transcriber.vad._in_speech = True
+        # Simulate audio accumulating in VAD buffer
+        for _ in range(10):
+            transcriber.vad._buffer_audio(_SILENCE_CHUNK)
+        transcriber.vad._speech_samples = 5120
+        transcriber.vad._in_speech = True
 
-            # Mute should clear buffer
-            transcriber.mute()
+        # Mute should clear buffer
+        transcriber.mute()
 
-            assert transcriber.vad._speech_buffer == []
-            assert transcriber.vad._speech_samples == 0
-            assert not transcriber.vad._in_speech
+        assert transcriber.vad._buffered_samples == 0
+        assert transcriber.vad._speech_samples == 0
+        assert not transcriber.vad._in_speech
 
-            # Simulate more audio during mute (this shouldn't happen in real use
-            # because _process_loop skips VAD, but test the safety)
-            transcriber.vad._speech_buffer = [np.zeros(512, dtype=np.float32) for _ in range(5)]
+        # Simulate more audio during mute (this shouldn't happen in real use
+        # because _process_loop skips VAD, but test the safety)
+        for _ in range(5):
+            transcriber.vad._buffer_audio(_SILENCE_CHUNK)
 
-            # Unmute should clear again
-            transcriber.unmute()
+        # Unmute should clear again
+        transcriber.unmute()
 
-            assert transcriber.vad._speech_buffer == []
+        assert transcriber.vad._buffered_samples == 0
 
-    def test_muted_state_prevents_vad_processing(self):
+    def test_muted_state_prevents_vad_processing(self, mock_whisper_model):
         """Verify that muted state skips VAD in process loop."""
-        from audio.fast_whisper_service import FastWhisperTranscriber
-        from unittest.mock import patch, MagicMock
+        transcriber = FastWhisperTranscriber()
 
-        with patch('audio.fast_whisper_service.get_model'):
-            transcriber = FastWhisperTranscriber()
+        # Mock VAD to track calls
+        transcriber.vad.process_chunk = MagicMock()
 
-            # Mock VAD to track calls
-            transcriber.vad.process_chunk = MagicMock()
+        # Put transcriber in running + muted state
+        transcriber._running = True
+        transcriber._muted = True
 
-            # Put transcriber in running + muted state
-            transcriber._running = True
-            transcriber._muted = True
+        # Simulate audio chunk arriving
+        audio_chunk = _SILENCE_CHUNK
+        transcriber._audio_queue.put(audio_chunk)
 
-            # Simulate audio chunk arriving
-            audio_chunk = np.zeros(512, dtype=np.float32)
-            transcriber._audio_queue.put(audio_chunk)
+        # Process one iteration
+        chunk = transcriber._audio_queue.get_nowait()
+        with transcriber._mute_lock:
+            if transcriber._muted:
+                pass  # Skip VAD - this is what _process_loop does
+            else:
+                transcriber.vad.process_chunk(chunk)
 
-            # Process one iteration
-            try:
-                chunk = transcriber._audio_queue.get(timeout=0.1)
-                with transcriber._mute_lock:
-                    if transcriber._muted:
-                        pass  # Skip VAD - this is what _process_loop does
-                    else:
-                        transcriber.vad.process_chunk(chunk)
-            except queue.Empty:
-                pass
-
-            # VAD should NOT have been called
-            transcriber.vad.process_chunk.assert_not_called()
-
-    def test_interrupt_detection_works_while_muted(self):
-        """Verify interrupts are still detected even when muted."""
-        from audio.fast_whisper_service import FastWhisperTranscriber
-        from audio.vad import SpeechSegment
-        from unittest.mock import patch, MagicMock
+        # VAD should NOT have been called
+        transcriber.vad.process_chunk.assert_not_called()
 
+    def test_interrupt_detection_works_while_muted(self, mock_whisper_model):
+        """Verify interrupts are still detected even when muted."""
         interrupts = []
 
         def on_interrupt(text):
@@ -102,23 +116,23 @@ class TestEchoCancellationIntegration:
             MagicMock(language="en")
         )
 
-        with patch('audio.fast_whisper_service.get_model', return_value=mock_model):
-            transcriber = FastWhisperTranscriber(on_interrupt=on_interrupt)
-            transcriber._muted = True
+        mock_whisper_model.return_value = mock_model
+        transcriber = FastWhisperTranscriber(on_interrupt=on_interrupt)
+        transcriber._muted = True
 
-            # Simulate speech segment
-            segment = SpeechSegment(
-                audio=np.zeros(16000, dtype=np.float32),
-                start_time=time.time(),
-                end_time=time.time() + 1,
-                duration_ms=1000
-            )
+        # Simulate speech segment
+        segment = SpeechSegment(
+            audio=_SILENCE_1S,
+            start_time=time.time(),
+            end_time=time.time() + 1,
+            duration_ms=1000
+        )
 
-            transcriber._handle_speech(segment)
+        transcriber._handle_speech(segment)
 
-            # Interrupt should have been detected
-            assert len(interrupts) == 1
-            assert "Kira stop" in interrupts[0]
+        # Interrupt should have been detected
+        assert len(interrupts) == 1
+        assert "Kira stop" in interrupts[0]
 
 
 class TestEventFlowIntegration:
@@ -126,8 +140,6 @@ class TestEventFlowIntegration:
 
     def test_perception_event_queue_ordering(self):
         """Verify events are queued and retrieved in order."""
-        from kira_perception import KiraPerception
-
         perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
 
         # Emit multiple events
@@ -136,29 +148,23 @@ class TestEventFlowIntegration:
 
         # Retrieve and verify order
         for i in range(5):
-            event = perception.get_event(timeout=0.1)
+            event = perception.get_event(timeout=0)
             assert event is not None
             assert event.data['index'] == i
 
     def test_perception_event_queue_nonblocking(self):
         """Verify get_event doesn't block indefinitely."""
-        from kira_perception import KiraPerception
-
         perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
 
         start = time.time()
-        event = perception.get_event(timeout=0.1)
+        event = perception.get_event(timeout=0.02)
         elapsed = time.time() - start
 
         assert event is None
         assert elapsed < 0.5  # Should return quickly after timeout
 
-    def test_speak_command_format(self):
-        """Verify speak command generates correct JSON."""
-        from kira_perception import KiraPerception
-        import json
-        from io import StringIO
-
+    def test_speak_passes_text_to_tts(self):
+        """Verify speak() hands the text to the TTS engine."""
         # Enable TTS so speak() actually does something
         perception = KiraPerception(prewarm=False, enable_tts=True, enable_stt=False)
 
@@ -184,52 +190,43 @@ class TestEventFlowIntegration:
         assert "Hello world!" in spoken_texts
 
 
+@pytest.mark.benchmark
 class TestTimingIntegration:
     """Test timing characteristics of the perception system."""
 
     def test_vad_processing_speed(self):
         """Verify VAD can process chunks fast enough for real-time."""
-        from audio.vad import SileroVAD, CHUNK_SAMPLES
-
         vad = SileroVAD()
 
-        # Generate test audio (silence)
-        audio_chunk = np.zeros(CHUNK_SAMPLES, dtype=np.float32)
-
-        # Warmup
-        vad.process_chunk(audio_chunk)
+        # Test audio (silence), reused by every call
+        audio_chunk = _SILENCE_CHUNK
 
-        # Time multiple chunks
-        latencies = []
+        # Warmup so graph setup doesn't count against the average
         for _ in range(10):
-            start = time.time()
             vad.process_chunk(audio_chunk)
-            latencies.append((time.time() - start) * 1000)
 
-        avg_latency = sum(latencies) / len(latencies)
-        max_latency = max(latencies)
+        # Time multiple chunks as one batch
+        start = time.perf_counter_ns()
+        for _ in range(100):
+            vad.process_chunk(audio_chunk)
+        avg_latency = (time.perf_counter_ns() - start) / 100 / 1e6
 
-        print(f"\n  VAD latencies: avg={avg_latency:.1f}ms, max={max_latency:.1f}ms")
+        print(f"\n  VAD latency: avg={avg_latency:.1f}ms")
 
         # VAD should be < 10ms per chunk for real-time (32ms chunks)
         assert avg_latency < 10, f"VAD too slow: {avg_latency}ms avg"
 
     def test_event_emission_speed(self):
         """Verify event emission is fast."""
-        from kira_perception import KiraPerception
-
         perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
 
-        latencies = []
+        # Time the whole batch with one timer pair
+        start = time.perf_counter_ns()
         for i in range(100):
-            start = time.time()
             perception._emit_event('visual', {'index': i})
-            latencies.append((time.time() - start) * 1000)
+        avg_latency = (time.perf_counter_ns() - start) / 100 / 1e6
 
-        avg_latency = sum(latencies) / len(latencies)
-        max_latency = max(latencies)
-
-        print(f"\n  Event emission latencies: avg={avg_latency:.3f}ms, max={max_latency:.3f}ms")
+        print(f"\n  Event emission latency: avg={avg_latency:.3f}ms")
 
         # Event emission should be sub-millisecond
         assert avg_latency < 1, f"Event emission too slow: {avg_latency}ms avg"
@@ -238,26 +235,26 @@ class TestTimingIntegration:
 class TestConcurrencyIntegration:
     """Test concurrent access patterns."""
 
-    def test_concurrent_event_emission_and_retrieval(self):
+    def test_concurrent_event_emission_and_retrieval(self, pool):
         """Verify events can be emitted and retrieved concurrently."""
-        from kira_perception import KiraPerception
-
         perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
 
         emitted = []
         retrieved = []
         errors = []
+        start = threading.Event()
 
         def emitter():
+            start.wait()
             try:
                 for i in range(50):
                     perception._emit_event('visual', {'index': i})
                     emitted.append(i)
-                    time.sleep(0.001)
             except Exception as e:
                 errors.append(f"Emitter error: {e}")
 
         def retriever():
+            start.wait()
             try:
                 while len(retrieved) < 50:
                     event = perception.get_event(timeout=0.1)
@@ -266,14 +263,12 @@ class TestConcurrencyIntegration:
             except Exception as e:
                 errors.append(f"Retriever error: {e}")
 
-        emit_thread = threading.Thread(target=emitter)
-        retrieve_thread = threading.Thread(target=retriever)
-
-        emit_thread.start()
-        retrieve_thread.start()
+        emit_future = pool.submit(emitter)
+        retrieve_future = pool.submit(retriever)
+        start.set()
 
-        emit_thread.join(timeout=5)
-        retrieve_thread.join(timeout=5)
+        emit_future.result(timeout=5)
+        retrieve_future.result(timeout=5)
 
         assert not errors, f"Errors occurred: {errors}"
         assert len(emitted) == 50
@@ -281,50 +276,41 @@ class TestConcurrencyIntegration:
         # Order should be preserved
         assert retrieved == list(range(50))
 
-    def test_mute_unmute_thread_safety(self):
+    def test_mute_unmute_thread_safety(self, mock_whisper_model, pool):
         """Verify mute/unmute is thread-safe."""
-        from audio.fast_whisper_service import FastWhisperTranscriber
-        from unittest.mock import patch
+        transcriber = FastWhisperTranscriber()
 
-        with patch('audio.fast_whisper_service.get_model'):
-            transcriber = FastWhisperTranscriber()
-
-            errors = []
-            operations = []
+        errors = []
+        operations = []
+        start = threading.Event()
 
-            def toggler(id):
-                try:
-                    for _ in range(100):
-                        transcriber.mute()
-                        operations.append(f"{id}:mute")
-                        time.sleep(0.001)
-                        transcriber.unmute()
-                        operations.append(f"{id}:unmute")
-                except Exception as e:
-                    errors.append(f"Thread {id} error: {e}")
+        def toggler(id):
+            start.wait()
+            try:
+                for _ in range(100):
+                    transcriber.mute()
+                    operations.append(f"{id}:mute")
+                    transcriber.unmute()
+                    operations.append(f"{id}:unmute")
+            except Exception as e:
+                errors.append(f"Thread {id} error: {e}")
 
-            threads = [threading.Thread(target=toggler, args=(i,)) for i in range(3)]
+        futures = [pool.submit(toggler, i) for i in range(3)]
+        start.set()
 
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join(timeout=5)
+        for future in futures:
+            future.result(timeout=5)
 
-            assert not errors, f"Errors occurred: {errors}"
-            # Should have completed all operations
-            assert len(operations) == 600  # 3 threads * 100 iterations * 2 ops
+        assert not errors, f"Errors occurred: {errors}"
+        # Should have completed all operations
+        assert len(operations) == 600  # 3 threads * 100 iterations * 2 ops
 
 
 class TestDataFormatIntegration:
     """Test that data formats match between Python emission and Ruby consumption."""
 
-    def test_visual_event_has_required_fields(self):
+    def test_visual_event_has_required_fields(self, perception):
         """Verify visual events have all fields Ruby expects."""
-        from kira_perception import KiraPerception
-        import json
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
         perception._emit_event('visual', {
             'emotion': 'happy',
             'description': 'Test description',
@@ -333,47 +319,34 @@ class TestDataFormatIntegration:
             'is_full_analysis': False
         })
 
-        event = perception.get_event(timeout=0.1)
-        json_str = event.to_json()
-        parsed = json.loads(json_str)
+        event = perception.get_event(timeout=0)
 
         # Verify structure matches Ruby expectations
-        assert 'type' in parsed
-        assert 'data' in parsed
-        assert 'timestamp' in parsed
+        assert event.type == 'visual'
+        assert event.timestamp is not None
 
-        data = parsed['data']
+        data = event.data
         assert 'emotion' in data
         assert 'description' in data
         assert 'inference_ms' in data
         assert 'is_full_analysis' in data
 
-    def test_voice_event_has_required_fields(self):
+    def test_voice_event_has_required_fields(self, perception):
         """Verify voice events have all fields Ruby expects."""
-        from kira_perception import KiraPerception
-        import json
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
         perception._emit_event('voice', {
             'text': 'Hello Kira',
             'language': 'en',
             'latency_ms': 350
         })
 
-        event = perception.get_event(timeout=0.1)
-        json_str = event.to_json()
-        parsed = json.loads(json_str)
+        event = perception.get_event(timeout=0)
 
-        data = parsed['data']
+        data = event.data
         assert 'text' in data
         assert data['text'] == 'Hello Kira'
 
     def test_json_output_is_single_line(self):
         """Verify JSON output is single line (required for line-based IPC)."""
-        from kira_perception import PerceptionEvent
-        import json
-
         event = PerceptionEvent(
             type='visual',
             data={
@@ -0,0 +1,74 @@
+"""Tests for the Moondream scene description cache."""
+
+import numpy as np
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from vlm.frame_diff import perceptual_hash
+from vlm.moondream_service import MoondreamVLM, SceneDescription, VLMService
+
+
+def _scene(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)
+
+
+class TestDescriptionCache:
+    """Near-duplicate frames should reuse a description without the model."""
+
+    def test_cached_description_skips_model(self):
+        """A frame whose hash is cached is answered from the cache."""
+        vlm = MoondreamVLM()
+        frame = _scene(0)
+        vlm._desc_cache[perceptual_hash(frame)] = SceneDescription(
+            description="a desk", timestamp=0.0, inference_ms=900
+        )
+
+        with patch('vlm.moondream_service.get_model') as get_model:
+            result = vlm.describe(frame)
+
+        get_model.assert_not_called()
+        assert result.description == "a desk"
+        assert result.cached
+        assert result.timestamp > 0.0
+        assert vlm._last_description is result
+
+    def test_lookup_refreshes_entry(self):
+        """A hit within CACHE_MAX_DISTANCE bits marks the entry most recently used."""
+        vlm = MoondreamVLM()
+        for key in (0b0, 0xFF00, 0xFF0000):
+            vlm._desc_cache[key] = SceneDescription(hex(key), 0.0, 0)
+
+        hit = vlm._cache_lookup(0b11)  # Two bits away from 0b0
+
+        assert hit.description == '0x0'
+        assert list(vlm._desc_cache) == [0xFF00, 0xFF0000, 0b0]
+        assert vlm._cache_lookup(0xF0F0F0F0) is None
+
+    def test_has_changed_compares_word_overlap(self):
+        """has_changed() compares against the words of the last description."""
+        vlm = MoondreamVLM()
+        assert vlm.has_changed("anything")
+
+        vlm._remember(SceneDescription("A person typing at a desk", 1.0, 0))
+
+        assert not vlm.has_changed("a person typing at a desk")
+        assert vlm.has_changed("a cat asleep on the sofa")
+
+
+class TestVLMService:
+    """Test the latest-frame slot feeding the service loop."""
+
+    def test_submit_frame_keeps_only_latest(self):
+        """A newer frame replaces one that hasn't been picked up yet."""
+        service = VLMService()
+        first, second = _scene(0), _scene(1)
+
+        service.submit_frame(first)
+        service.submit_frame(second)
+
+        assert service._frame_event.is_set()
+        assert service._latest_frame is second
@@ -6,19 +6,36 @@ format expected by the Ruby UnifiedClient.
 
 import pytest
 import json
-import sys
-import os
+import time
+from unittest.mock import patch
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+
+from kira_perception import PerceptionEvent
+from audio.fast_whisper_service import TranscriptionResult
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decoders every to_json() payload must round-trip through
+JSON_LOADERS = [
+    pytest.param(json.loads, id="json"),
+    pytest.param(
+        orjson.loads if orjson else None,
+        id="orjson",
+        marks=pytest.mark.skipif(orjson is None, reason="orjson not installed"),
+    ),
+]
 
 
 class TestPerceptionEventFormat:
     """Test PerceptionEvent dataclass and JSON serialization."""
 
-    def test_perception_event_to_json(self):
+    @pytest.mark.parametrize("loader", JSON_LOADERS)
+    def test_perception_event_to_json(self, loader):
         """Event should serialize to expected JSON format."""
-        from kira_perception import PerceptionEvent
-
         event = PerceptionEvent(
             type='visual',
             data={'emotion': 'happy', 'description': 'Person smiling'},
@@ -26,18 +43,41 @@ class TestPerceptionEventFormat:
         )
 
         json_str = event.to_json()
-        parsed = json.loads(json_str)
+        parsed = loader(json_str)
 
         assert parsed['type'] == 'visual'
         assert parsed['data']['emotion'] == 'happy'
         assert parsed['data']['description'] == 'Person smiling'
         assert parsed['timestamp'] == 1234567890.123
 
+    @pytest.mark.parametrize("loader", JSON_LOADERS)
+    def test_to_json_numpy_scalars(self, loader):
+        """numpy scalars from inference should serialize as plain numbers."""
+        event = PerceptionEvent(type='visual', data={'frame_diff': np.float64(0.25)}, timestamp=1.5)
+
+        parsed = loader(event.to_json())
+
+        assert parsed['data'] == {'frame_diff': 0.25}
+
+    def test_to_json_falls_back_to_stdlib(self):
+        """Values orjson rejects should still serialize through the json module."""
+        event = PerceptionEvent(type='test', data={'big': 2 ** 70}, timestamp=1.5)
+
+        assert json.loads(event.to_json())['data']['big'] == 2 ** 70
+
+    def test_to_json_without_orjson(self):
+        """Stdlib fallback should produce the same event."""
+        event = PerceptionEvent(type='voice', data={'text': 'Hello 日本語'}, timestamp=1.5)
+
+        with patch('kira_perception.orjson', None):
+            json_str = event.to_json()
+
+        assert json.loads(json_str) == {
+            'type': 'voice', 'data': {'text': 'Hello 日本語'}, 'timestamp': 1.5
+        }
+
     def test_perception_event_auto_timestamp(self):
         """Event should auto-generate timestamp if not provided."""
-        from kira_perception import PerceptionEvent
-        import time
-
         before = time.time()
         event = PerceptionEvent(type='test', data={})
         after = time.time()
@@ -48,176 +88,82 @@ class TestPerceptionEventFormat:
 class TestKiraPerceptionEmitEvent:
     """Test KiraPerception._emit_event method."""
 
-    def test_emit_visual_event_format(self):
-        """Visual event should have correct structure."""
-        from kira_perception import KiraPerception
-        import json
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
-        # Capture emitted event
-        perception._emit_event('visual', {
+    @pytest.mark.parametrize("event_type,payload,checks", [
+        ('visual', {
             'emotion': 'curious',
             'description': 'Person looking at screen',
             'inference_ms': 150,
             'frame_diff': 0.05,
             'is_full_analysis': False
-        })
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event is not None
-        assert event.type == 'visual'
-        assert event.data['emotion'] == 'curious'
-        assert event.data['description'] == 'Person looking at screen'
-        assert event.data['inference_ms'] == 150
-        assert event.data['is_full_analysis'] == False
-
-    def test_emit_visual_full_event_format(self):
-        """Full visual analysis event should have correct structure."""
-        from kira_perception import KiraPerception
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
-        perception._emit_event('visual_full', {
+        }, [
+            ('emotion', 'curious'),
+            ('description', 'Person looking at screen'),
+            ('inference_ms', 150),
+            ('is_full_analysis', False),
+        ]),
+        ('visual_full', {
             'description': 'A person sitting at a desk, typing on a laptop',
             'inference_ms': 800,
             'is_full_analysis': True
-        })
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event.type == 'visual_full'
-        assert 'typing on a laptop' in event.data['description']
-        assert event.data['is_full_analysis'] == True
-
-    def test_emit_voice_event_format(self):
-        """Voice event should have correct structure."""
-        from kira_perception import KiraPerception
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
-        perception._emit_event('voice', {
+        }, [
+            ('description', 'A person sitting at a desk, typing on a laptop'),
+            ('is_full_analysis', True),
+        ]),
+        ('voice', {
             'text': 'Hello Kira',
             'language': 'en',
             'latency_ms': 350
-        })
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event.type == 'voice'
-        assert event.data['text'] == 'Hello Kira'
-        assert event.data['language'] == 'en'
-
-    def test_emit_interrupt_event_format(self):
-        """Interrupt event should have correct structure."""
-        from kira_perception import KiraPerception
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
-        perception._emit_event('interrupt', {'text': 'stop'})
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event.type == 'interrupt'
-        assert event.data['text'] == 'stop'
-
-    def test_emit_ready_event_format(self):
-        """Ready event should have correct structure."""
-        from kira_perception import KiraPerception
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
-        perception._emit_event('ready', {
+        }, [
+            ('text', 'Hello Kira'),
+            ('language', 'en'),
+        ]),
+        ('interrupt', {'text': 'stop'}, [('text', 'stop')]),
+        ('ready', {
             'camera': True,
             'vlm_hz': 2.0,
             'stt': False,
             'tts': False,
             'prewarm': False
-        })
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event.type == 'ready'
-        assert event.data['camera'] == True
-
-    def test_emit_error_event_format(self):
-        """Error event should have correct structure."""
-        from kira_perception import KiraPerception
-
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
-
-        perception._emit_event('error', {'message': 'Camera failed'})
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event.type == 'error'
-        assert event.data['message'] == 'Camera failed'
-
-    def test_emit_audio_state_event_format(self):
-        """Audio state event should have correct structure."""
-        from kira_perception import KiraPerception
+        }, [('camera', True)]),
+        ('error', {'message': 'Camera failed'}, [('message', 'Camera failed')]),
+        ('audio_state', {'state': 'SPEAKING'}, [('state', 'SPEAKING')]),
+    ])
+    def test_emit_event_format(self, perception, event_type, payload, checks):
+        """Each event type should keep its type and payload fields."""
+        perception._emit_event(event_type, payload)
 
-        perception = KiraPerception(prewarm=False, enable_tts=False, enable_stt=False)
+        event = perception.get_event(timeout=0)
 
-        perception._emit_event('audio_state', {'state': 'SPEAKING'})
-
-        event = perception.get_event(timeout=0.1)
-
-        assert event.type == 'audio_state'
-        assert event.data['state'] == 'SPEAKING'
+        assert event is not None
+        assert event.type == event_type
+        for key, value in checks:
+            assert event.data[key] == value
 
 
 class TestEventJsonSerialization:
     """Test that events serialize correctly for IPC."""
 
-    def test_event_json_round_trip(self):
+    @pytest.mark.parametrize("loader", JSON_LOADERS)
+    @pytest.mark.parametrize("event_type,data", [
+        ('visual', {
+            'emotion': 'happy',
+            'description': 'Test description',
+            'nested': {'key': 'value'}
+        }),
+        ('voice', {'text': 'Hello "Kira"! How\'s it going? 日本語'}),
+        ('visual', {'description': 'Line 1\nLine 2\nLine 3'}),
+    ], ids=['nested', 'special_characters', 'newlines'])
+    def test_event_json_round_trip(self, loader, event_type, data):
         """Event should survive JSON round-trip."""
-        from kira_perception import PerceptionEvent
-
-        original = PerceptionEvent(
-            type='visual',
-            data={
-                'emotion': 'happy',
-                'description': 'Test description',
-                'nested': {'key': 'value'}
-            }
-        )
-
-        json_str = original.to_json()
-        parsed = json.loads(json_str)
-
-        assert parsed['type'] == original.type
-        assert parsed['data'] == original.data
-        assert parsed['timestamp'] == original.timestamp
+        original = PerceptionEvent(type=event_type, data=data)
 
-    def test_event_json_handles_special_characters(self):
-        """Event should handle special characters in text."""
-        from kira_perception import PerceptionEvent
+        parsed = loader(original.to_json())
 
-        event = PerceptionEvent(
-            type='voice',
-            data={'text': 'Hello "Kira"! How\'s it going? 日本語'}
-        )
-
-        json_str = event.to_json()
-        parsed = json.loads(json_str)
-
-        assert parsed['data']['text'] == 'Hello "Kira"! How\'s it going? 日本語'
-
-    def test_event_json_handles_newlines(self):
-        """Event should handle newlines in text."""
-        from kira_perception import PerceptionEvent
-
-        event = PerceptionEvent(
-            type='visual',
-            data={'description': 'Line 1\nLine 2\nLine 3'}
-        )
-
-        json_str = event.to_json()
-        parsed = json.loads(json_str)
-
-        assert parsed['data']['description'] == 'Line 1\nLine 2\nLine 3'
+        assert parsed == {
+            'type': original.type,
+            'data': original.data,
+            'timestamp': original.timestamp,
+        }
 
 
 class TestSTTEventFormat:
@@ -225,8 +171,6 @@ class TestSTTEventFormat:
 
     def test_transcription_result_fields(self):
         """TranscriptionResult should have expected fields."""
-        from audio.fast_whisper_service import TranscriptionResult
-
         result = TranscriptionResult(
             text='Hello Kira',
             language='en',
@@ -258,3 +202,17 @@ class TestVLMEventFormat:
         assert result.activity == 'typing'
         assert result.summary == 'Person smiling at screen'
         assert result.inference_ms == 150
+
+    @pytest.mark.parametrize("response,expected", [
+        ("The person looks Happy and focused.", 'happy'),
+        ("They seem focused, maybe a little tired.", 'focused'),
+        ("An unhappy-looking person at a desk.", 'neutral'),
+        ("", 'neutral'),
+    ])
+    def test_extract_emotion(self, response, expected):
+        """Emotion should be the first whole-word keyword in the response."""
+        from vlm.fast_vlm_service import FastVLM
+
+        vlm = FastVLM(prewarm=False)
+
+        assert vlm._extract_emotion(response) == expected
@@ -8,19 +8,37 @@ Supports voice cloning and interruptable playback.
 import sys
 import json
 import tempfile
-import subprocess
-import signal
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import threading
 import queue
 import os
+import wave
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Handle both direct execution and module import
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tts.playback import get_player
+else:
+    from .playback import get_player
 
 # Lazy imports for faster startup
 _model = None
 _model_lock = threading.Lock()
 _model_type = None  # 'turbo' or 'standard'
 
+# Number of reusable WAV files kept per TTS instance
+WAV_POOL_SIZE = 8
+
+# Utterances waiting for playback; the oldest is dropped when full
+AUDIO_QUEUE_SIZE = 4
+
 
 def _load_turbo_model_local(device: str):
     """
@@ -78,6 +96,17 @@ def get_model(prefer_turbo: bool = True):
     return _model
 
 
+def _preload_model(prefer_turbo: bool):
+    """Load the model on a daemon thread so the first speak() doesn't pay for all of it."""
+    def load():
+        try:
+            get_model(prefer_turbo)
+        except Exception as e:
+            print(f"Chatterbox preload failed: {e}", file=sys.stderr)
+    
+    threading.Thread(target=load, daemon=True).start()
+
+
 class ChatterboxTTS:
     """
     Text-to-speech using Chatterbox with interruptable playback.
@@ -86,17 +115,37 @@ class ChatterboxTTS:
     - Voice cloning from reference audio
     - Non-blocking playback with interrupt capability
     - Queue-based playback for multiple utterances
+    
+    Audio is played in-process from memory. Non-blocking calls also write
+    it into a small pool of reusable WAV files so a path can be returned;
+    a slot returns to the pool once it has been played, so a returned path
+    is only valid until then.
     """
     
-    def __init__(self, voice_ref_path: Optional[str] = None, prefer_turbo: bool = True):
+    def __init__(
+        self,
+        voice_ref_path: Optional[str] = None,
+        prefer_turbo: bool = True,
+        prewarm: bool = True,
+        wav_pool_size: int = WAV_POOL_SIZE,
+    ):
         self.voice_ref_path = voice_ref_path
         self.prefer_turbo = prefer_turbo
-        self._audio_queue = queue.Queue()
+        self._audio_queue = queue.Queue(maxsize=AUDIO_QUEUE_SIZE)
         self._playback_thread = None
-        self._playback_process: Optional[subprocess.Popen] = None
-        self._playback_lock = threading.Lock()
+        self._player = get_player()
         self._interrupted = False
         
+        # Free WAV slots; grows past wav_pool_size only if playback falls behind
+        self._wav_paths = []
+        self._wav_pool = queue.Queue()
+        for _ in range(wav_pool_size):
+            self._wav_pool.put(self._new_wav_path())
+        
+        # Start loading the model now; speak() waits on the same lock if it's not done
+        if prewarm:
+            _preload_model(prefer_turbo)
+        
     def speak(self, text: str, blocking: bool = True, timeout: float = 30.0) -> Optional[str]:
         """
         Convert text to speech and play it.
@@ -120,33 +169,66 @@ class ChatterboxTTS:
         
         try:
             self._interrupted = False
-            model = get_model(self.prefer_turbo)
-            
-            # Generate audio
-            import torchaudio as ta
-            
-            if self.voice_ref_path and Path(self.voice_ref_path).exists():
-                wav = model.generate(text, audio_prompt_path=self.voice_ref_path)
-            else:
-                wav = model.generate(text)
-            
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-                ta.save(f.name, wav, model.sr)
-                audio_path = f.name
+            audio, sample_rate = self.synthesize(text)
             
             if blocking:
-                self._play_audio(audio_path)
+                self._play_audio(audio, sample_rate)
                 return None
-            else:
-                self._audio_queue.put(audio_path)
-                self._ensure_playback_thread()
-                return audio_path
+            
+            # Save to a pooled WAV slot (overwritten in place) for the caller
+            audio_path = self._acquire_wav_path()
+            try:
+                self._write_wav(audio_path, audio, sample_rate)
+            except Exception:
+                self._release_wav_path(audio_path)
+                raise
+            
+            self._enqueue((audio_path, audio, sample_rate))
+            self._ensure_playback_thread()
+            return audio_path
                 
         except Exception as e:
             print(f"TTS generation error: {e}", file=sys.stderr)
             return None
     
+    def synthesize(self, text: str) -> Tuple[np.ndarray, int]:
+        """Generate speech for text without playing it. Returns (int16 samples, sample_rate)."""
+        wav, sample_rate = self._generate(text)
+        return self._to_int16(wav), sample_rate
+    
+    def synthesize_to_file(self, text: str, path: str) -> Tuple[np.ndarray, int]:
+        """Generate speech for text and save it as a WAV file at path. Returns what synthesize() does."""
+        audio, sample_rate = self.synthesize(text)
+        self._write_wav(path, audio, sample_rate)
+        return audio, sample_rate
+    
+    def play(self, audio: np.ndarray, sample_rate: int):
+        """Play int16 mono audio and wait until it has finished or is interrupted."""
+        self._play_audio(audio, sample_rate)
+    
+    def _generate(self, text: str):
+        """Generate speech for text. Returns (wav tensor, sample_rate)."""
+        model = get_model(self.prefer_turbo)
+        if self.voice_ref_path and Path(self.voice_ref_path).exists():
+            wav = model.generate(text, audio_prompt_path=self.voice_ref_path)
+        else:
+            wav = model.generate(text)
+        return wav, model.sr
+    
+    @staticmethod
+    def _to_int16(wav) -> np.ndarray:
+        """Convert a float waveform tensor in [-1, 1] to int16 samples."""
+        return (wav.squeeze().clamp(-1, 1).cpu().numpy() * 32767).astype(np.int16)
+    
+    @staticmethod
+    def _write_wav(path: str, audio: np.ndarray, sample_rate: int):
+        """Write int16 mono samples as a 16-bit PCM WAV file."""
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)  # 16-bit
+            wav.setframerate(sample_rate)
+            wav.writeframes(audio.tobytes())
+    
     def interrupt(self):
         """
         Interrupt current playback immediately.
@@ -154,54 +236,28 @@ class ChatterboxTTS:
         Stops any currently playing audio and clears the queue.
         """
         self._interrupted = True
+        self._player.abort(self)
         
-        with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
-                try:
-                    self._playback_process.terminate()
-                    self._playback_process.wait(timeout=0.5)
-                except:
-                    try:
-                        self._playback_process.kill()
-                    except:
-                        pass
-        
-        # Clear queue
+        # Clear queue, returning the dropped slots to the pool
         while not self._audio_queue.empty():
             try:
-                self._audio_queue.get_nowait()
+                item = self._audio_queue.get_nowait()
             except queue.Empty:
                 break
+            if item is not None:
+                self._release_wav_path(item[0])
         
         print("TTS interrupted", file=sys.stderr)
     
     def is_speaking(self) -> bool:
         """Check if currently speaking."""
-        with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
-                return True
-        return not self._audio_queue.empty()
+        return self._player.is_playing(self) or not self._audio_queue.empty()
     
-    def _play_audio(self, path: str):
-        """Play audio file using system command."""
+    def _play_audio(self, audio: np.ndarray, sample_rate: int):
+        """Play int16 audio through the output stream."""
         if self._interrupted:
             return
-            
-        with self._playback_lock:
-            # macOS: use afplay
-            self._playback_process = subprocess.Popen(
-                ['afplay', path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-        
-        try:
-            self._playback_process.wait()
-        except:
-            pass
-        finally:
-            with self._playback_lock:
-                self._playback_process = None
+        self._player.play(audio, sample_rate, self)
     
     def _ensure_playback_thread(self):
         """Ensure background playback thread is running."""
@@ -212,41 +268,100 @@ class ChatterboxTTS:
     def _playback_loop(self):
         """Background thread for non-blocking audio playback."""
         while True:
+            # Sleeps until there's something to play; None is close()'s signal to exit
+            item = self._audio_queue.get()
+            if item is None:
+                return
+            audio_path, audio, sample_rate = item
             try:
-                audio_path = self._audio_queue.get(timeout=1.0)
-                if not self._interrupted:
-                    self._play_audio(audio_path)
-                # Clean up temp file
-                try:
-                    os.unlink(audio_path)
-                except:
-                    pass
-            except queue.Empty:
-                continue
+                self._play_audio(audio, sample_rate)
             except Exception as e:
                 print(f"Playback error: {e}", file=sys.stderr)
+            finally:
+                self._release_wav_path(audio_path)
+    
+    def _enqueue(self, item):
+        """Queue an utterance for playback, dropping the oldest if the queue is full."""
+        while True:
+            try:
+                self._audio_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = self._audio_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if dropped is not None:
+                    self._release_wav_path(dropped[0])
+                    print("TTS backlog full, dropped oldest utterance", file=sys.stderr)
+    
+    def _new_wav_path(self) -> str:
+        """Create a WAV file for the pool."""
+        fd, path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        self._wav_paths.append(path)
+        return path
+    
+    def _acquire_wav_path(self) -> str:
+        """Take a free WAV slot, creating one if all are in use."""
+        try:
+            return self._wav_pool.get_nowait()
+        except queue.Empty:
+            return self._new_wav_path()
+    
+    def _release_wav_path(self, path: str):
+        """Return a WAV slot to the pool."""
+        self._wav_pool.put(path)
+    
+    def close(self):
+        """Interrupt playback, end the playback thread and delete the pooled WAV files."""
+        self.interrupt()
+        if self._playback_thread is not None:
+            self._enqueue(None)
+        for path in self._wav_paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._wav_paths = []
+
+
+def _parse_request(line: str) -> dict:
+    """Parse one JSON request line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line.strip())
+
+
+def _send(message: dict):
+    """Write one JSON response line to stdout."""
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(message) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(message), flush=True)
 
 
 def run_service():
     """Run as a simple stdin/stdout service."""
     tts = ChatterboxTTS()
     
-    print(json.dumps({'type': 'ready'}), flush=True)
+    _send({'type': 'ready'})
     
     for line in sys.stdin:
         try:
-            request = json.loads(line.strip())
+            request = _parse_request(line)
             
             if request.get('command') == 'interrupt':
                 tts.interrupt()
-                print(json.dumps({'status': 'interrupted'}), flush=True)
+                _send({'status': 'interrupted'})
                 continue
             
             if request.get('command') == 'status':
-                print(json.dumps({
+                _send({
                     'status': 'ok',
                     'speaking': tts.is_speaking()
-                }), flush=True)
+                })
                 continue
             
             text = request.get('text', '')
@@ -258,12 +373,57 @@ def run_service():
             if result:
                 response['audio_path'] = result
                 
-            print(json.dumps(response), flush=True)
+            _send(response)
             
         except json.JSONDecodeError as e:
-            print(json.dumps({'status': 'error', 'message': str(e)}), flush=True)
+            _send({'status': 'error', 'message': str(e)})
+        except Exception as e:
+            _send({'status': 'error', 'message': str(e)})
+
+
+def run_batch():
+    """
+    Run as a batch synthesizer.
+    
+    Reads 'output_path<TAB>text' lines from stdin. For each line, it saves the
+    speech to output_path, replies 'OK<TAB>output_path<TAB>duration_seconds'
+    (or 'ERR<TAB>output_path<TAB>message'), and plays it. The next line is
+    synthesized while the previous one plays.
+    """
+    tts = ChatterboxTTS(wav_pool_size=0)  # Files go to the requested paths instead
+    playback_queue = queue.Queue(maxsize=2)
+    
+    def playback_loop():
+        while True:
+            item = playback_queue.get()
+            if item is None:
+                return
+            tts.play(*item)
+    
+    playback_thread = threading.Thread(target=playback_loop, daemon=True)
+    playback_thread.start()
+    
+    for line in sys.stdin:
+        line = line.rstrip('\n')
+        if not line.strip():
+            continue
+        
+        output_path, sep, text = line.partition('\t')
+        if not sep or not text.strip():
+            print(f"ERR\t{output_path}\texpected output_path<TAB>text", flush=True)
+            continue
+        
+        try:
+            audio, sample_rate = tts.synthesize_to_file(text, output_path)
+            duration = len(audio) / sample_rate
+            print(f"OK\t{output_path}\t{duration:.2f}", flush=True)
+            playback_queue.put((audio, sample_rate))
         except Exception as e:
-            print(json.dumps({'status': 'error', 'message': str(e)}), flush=True)
+            print(f"ERR\t{output_path}\t{e}", flush=True)
+    
+    playback_queue.put(None)
+    playback_thread.join()
+    tts.close()
 
 
 if __name__ == '__main__':
@@ -302,5 +462,7 @@ if __name__ == '__main__':
             tts.interrupt()
             thread.join(timeout=1)
             print("Interrupted!")
+    elif len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        run_batch()
     else:
         run_service()
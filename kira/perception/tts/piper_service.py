@@ -7,16 +7,25 @@ This is 30-50x faster than Chatterbox.
 
 import sys
 import os
-import subprocess
-import tempfile
 import threading
 import queue
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator
+import numpy as np
+
+# Handle both direct execution and module import
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tts.playback import get_player
+else:
+    from .playback import get_player
 
 # Default voice model path
 DEFAULT_VOICE_PATH = os.path.expanduser("~/.local/share/piper-voices/en_US-amy-medium.onnx")
 
+# Utterances waiting for playback; the oldest is dropped when full
+TEXT_QUEUE_SIZE = 4
+
 # Lazy load
 _voice = None
 _voice_lock = threading.Lock()
@@ -35,6 +44,17 @@ def get_voice(model_path: str = DEFAULT_VOICE_PATH):
     return _voice
 
 
+def _preload_voice(model_path: str):
+    """Load the voice on a daemon thread so the first speak() doesn't pay for all of it."""
+    def load():
+        try:
+            get_voice(model_path)
+        except Exception as e:
+            print(f"Piper preload failed: {e}", file=sys.stderr)
+    
+    threading.Thread(target=load, daemon=True).start()
+
+
 class PiperTTS:
     """
     Fast text-to-speech using Piper.
@@ -42,79 +62,48 @@ class PiperTTS:
     Target: <100ms generation for typical sentences (vs 2-5s with Chatterbox).
     """
     
-    def __init__(self, voice_path: str = DEFAULT_VOICE_PATH):
+    def __init__(self, voice_path: str = DEFAULT_VOICE_PATH, prewarm: bool = True):
         self.voice_path = voice_path
-        self._audio_queue = queue.Queue()
+        # (text, generation) items for the playback thread; None ends it
+        self._text_queue = queue.Queue(maxsize=TEXT_QUEUE_SIZE)
+        self._generation = 0  # Bumped by interrupt() to discard queued speech
+        self._speaking = False
         self._playback_thread = None
-        self._playback_process: Optional[subprocess.Popen] = None
-        self._playback_lock = threading.Lock()
-        self._interrupted = False
+        self._player = get_player()
+        
+        # Start loading the voice now; speak() waits on the same lock if it's not done
+        if prewarm:
+            _preload_voice(voice_path)
     
-    def speak(self, text: str, blocking: bool = True) -> Optional[str]:
+    def speak(self, text: str, blocking: bool = True) -> None:
         """
         Convert text to speech and play it.
         
+        Non-blocking speech is synthesized on the playback thread, so unlike
+        earlier versions no WAV path is returned.
+        
         Args:
             text: Text to speak
-            blocking: If True, wait for audio to finish
-            
-        Returns:
-            Path to generated audio file (if not blocking)
+            blocking: If True, wait for audio to finish; otherwise queue it
         """
         if not text or not text.strip():
-            return None
-        
-        self._interrupted = False
-        voice = get_voice(self.voice_path)
-        
-        # Generate audio
-        audio_bytes = b''
-        sample_rate = None
-        for chunk in voice.synthesize(text):
-            audio_bytes += chunk.audio_int16_bytes
-            sample_rate = chunk.sample_rate
-        
-        if not audio_bytes:
-            return None
-        
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-            # Write WAV header + data
-            import wave
-            with wave.open(f.name, 'wb') as wav:
-                wav.setnchannels(1)
-                wav.setsampwidth(2)  # 16-bit
-                wav.setframerate(sample_rate)
-                wav.writeframes(audio_bytes)
-            audio_path = f.name
+            return
         
         if blocking:
-            self._play_audio(audio_path)
-            return None
+            self._speak(text, self._generation)
         else:
-            self._audio_queue.put(audio_path)
+            self._enqueue((text, self._generation))
             self._ensure_playback_thread()
-            return audio_path
     
     def interrupt(self):
         """Stop current playback immediately."""
-        self._interrupted = True
-        
-        with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
-                try:
-                    self._playback_process.terminate()
-                    self._playback_process.wait(timeout=0.5)
-                except:
-                    try:
-                        self._playback_process.kill()
-                    except:
-                        pass
+        self._generation += 1
+        self._player.abort(self)
         
         # Clear queue
-        while not self._audio_queue.empty():
+        while not self._text_queue.empty():
             try:
-                self._audio_queue.get_nowait()
+                self._text_queue.get_nowait()
             except queue.Empty:
                 break
         
@@ -122,31 +111,53 @@ class PiperTTS:
     
     def is_speaking(self) -> bool:
         """Check if currently speaking."""
-        with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
-                return True
-        return not self._audio_queue.empty()
-    
-    def _play_audio(self, path: str):
-        """Play audio file."""
-        if self._interrupted:
+        return self._speaking or not self._text_queue.empty()
+    
+    def close(self):
+        """Stop playback and end the playback thread."""
+        self.interrupt()
+        if self._playback_thread is not None:
+            self._enqueue(None)
+    
+    def _speak(self, text: str, generation: int):
+        """Synthesize text and play each chunk as soon as it is ready, unless interrupted."""
+        if self._generation != generation:
             return
-        
-        with self._playback_lock:
-            # macOS: use afplay
-            self._playback_process = subprocess.Popen(
-                ['afplay', path],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
-        
+        self._speaking = True
         try:
-            self._playback_process.wait()
-        except:
-            pass
+            voice = get_voice(self.voice_path)
+            self._play_audio(self._synthesize(voice, text, generation), voice.config.sample_rate)
         finally:
-            with self._playback_lock:
-                self._playback_process = None
+            self._speaking = False
+    
+    def _synthesize(self, voice, text: str, generation: int) -> Iterator[np.ndarray]:
+        """Yield int16 chunks for text, stopping early if interrupted or on a synthesis error."""
+        try:
+            for chunk in voice.synthesize(text):
+                if self._generation != generation:
+                    return
+                yield np.frombuffer(chunk.audio_int16_bytes, dtype=np.int16)
+        except Exception as e:
+            # Reported here, as play_chunks would log it as a playback error
+            print(f"Piper synthesis error: {e}", file=sys.stderr)
+    
+    def _play_audio(self, chunks: Iterable[np.ndarray], sample_rate: int):
+        """Play int16 audio chunks through the output stream."""
+        self._player.play_chunks(chunks, sample_rate, self)
+    
+    def _enqueue(self, item):
+        """Queue an utterance for playback, dropping the oldest if the queue is full."""
+        while True:
+            try:
+                self._text_queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    dropped = self._text_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if dropped is not None:
+                    print("TTS backlog full, dropped oldest utterance", file=sys.stderr)
     
     def _ensure_playback_thread(self):
         """Ensure background playback thread is running."""
@@ -157,17 +168,12 @@ class PiperTTS:
     def _playback_loop(self):
         """Background thread for non-blocking playback."""
         while True:
+            # Sleeps until there's something to say; None is close()'s signal to exit
+            item = self._text_queue.get()
+            if item is None:
+                return
             try:
-                audio_path = self._audio_queue.get(timeout=1.0)
-                if not self._interrupted:
-                    self._play_audio(audio_path)
-                # Clean up temp file
-                try:
-                    os.unlink(audio_path)
-                except:
-                    pass
-            except queue.Empty:
-                continue
+                self._speak(*item)
             except Exception as e:
                 print(f"Playback error: {e}", file=sys.stderr)
 
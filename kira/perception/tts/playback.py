@@ -0,0 +1,165 @@
+"""
+In-process audio playback for the TTS services.
+
+Plays int16 mono audio through one persistent sounddevice output stream,
+so speaking doesn't pay a player process launch or a WAV round trip.
+"""
+
+import sys
+import atexit
+import threading
+import weakref
+from typing import Iterable
+import numpy as np
+
+# Frames per stream.write(); also how quickly an abort takes effect
+BLOCK_FRAMES = 1024
+
+
+class StreamPlayer:
+    """
+    Blocking playback through a reusable sounddevice OutputStream.
+
+    The stream is opened lazily and reopened only if the sample rate changes.
+    Several callers may share one player: each play() call holds the stream
+    until its audio has finished, so concurrent utterances play one after
+    another rather than interleaving. Callers identify themselves with an
+    owner object; abort(owner) may be called from any thread and stops only
+    that owner's playback, within one block.
+    """
+
+    def __init__(self):
+        self._stream = None
+        self._sample_rate = None
+        self._lock = threading.Lock()  # Guards the fields below
+        self._play_lock = threading.Lock()  # Held for a whole utterance
+        # Per-owner counters, bumped by abort(owner) to cancel that owner's calls
+        self._generations = weakref.WeakKeyDictionary()
+        self._current = None  # Owner whose audio is being written
+
+    def play(self, audio: np.ndarray, sample_rate: int, owner=None) -> bool:
+        """
+        Play int16 mono audio and wait until it has finished.
+
+        Returns:
+            False if playback was aborted, True otherwise.
+        """
+        return self.play_chunks((audio,), sample_rate, owner)
+
+    def play_chunks(self, chunks: Iterable[np.ndarray], sample_rate: int, owner=None) -> bool:
+        """
+        Play int16 mono chunks back to back and wait until they have finished.
+
+        chunks may be a generator that is still producing audio, so playback
+        starts with the first chunk rather than after the last one.
+
+        Args:
+            owner: Object identifying the caller for abort() and is_playing();
+                defaults to the player itself.
+
+        Returns:
+            False if playback was aborted, True otherwise.
+        """
+        owner = self if owner is None else owner
+        # Taken before waiting for the stream, so an abort while queued cancels too
+        generation = self._generation(owner)
+
+        with self._play_lock:
+            with self._lock:
+                if self._generations.get(owner, 0) != generation:
+                    return False
+                stream = self._get_stream(sample_rate)
+                if not stream.active:
+                    stream.start()
+                self._current = owner
+
+            try:
+                for audio in chunks:
+                    for start in range(0, len(audio), BLOCK_FRAMES):
+                        if self._generations.get(owner, 0) != generation:
+                            return False
+                        stream.write(audio[start:start + BLOCK_FRAMES])
+                # stop() returns once the buffered audio has been played
+                stream.stop()
+                return self._generations.get(owner, 0) == generation
+            except Exception as e:
+                if self._generations.get(owner, 0) != generation:
+                    return False  # Stream was aborted under us
+                print(f"Playback error: {e}", file=sys.stderr)
+                return False
+            finally:
+                with self._lock:
+                    self._current = None
+
+    def abort(self, owner=None):
+        """Stop owner's playback immediately, discarding its buffered audio."""
+        owner = self if owner is None else owner
+        with self._lock:
+            self._generations[owner] = self._generations.get(owner, 0) + 1
+            if self._current is owner:
+                self._abort_stream()
+
+    def is_playing(self, owner=None) -> bool:
+        """Check if one of owner's play() calls is writing audio."""
+        owner = self if owner is None else owner
+        return self._current is owner
+
+    def close(self):
+        """Abort any playback and release the output stream."""
+        with self._lock:
+            if self._current is not None:
+                owner = self._current
+                self._generations[owner] = self._generations.get(owner, 0) + 1
+                self._abort_stream()
+        with self._play_lock, self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    def _generation(self, owner) -> int:
+        """Current abort counter for owner."""
+        with self._lock:
+            return self._generations.setdefault(owner, 0)
+
+    def _abort_stream(self):
+        """Abort the stream so a blocked write() returns. Caller holds _lock."""
+        if self._stream is not None and self._stream.active:
+            try:
+                self._stream.abort()
+            except Exception:
+                pass
+
+    def _get_stream(self, sample_rate: int):
+        """Return the output stream for sample_rate, (re)opening it if needed."""
+        if self._stream is None or self._sample_rate != sample_rate:
+            import sounddevice as sd
+
+            if self._stream is not None:
+                self._stream.close()
+            self._stream = sd.OutputStream(
+                samplerate=sample_rate,
+                channels=1,
+                dtype='int16',
+                blocksize=BLOCK_FRAMES,
+            )
+            self._sample_rate = sample_rate
+        return self._stream
+
+
+_player = None
+_player_lock = threading.Lock()
+
+
+def get_player() -> StreamPlayer:
+    """
+    Process-wide StreamPlayer, so every TTS instance shares one output stream.
+
+    The shared stream is closed at process exit; TTS instances must not close it.
+    """
+    global _player
+    if _player is None:
+        with _player_lock:
+            if _player is None:
+                _player = StreamPlayer()
+                atexit.register(_player.close)
+    return _player
@@ -2,7 +2,7 @@
 Fast VLM Service for Kira.
 
 Optimized for speed with:
-1. Downscaled images (320x240) - 4x faster encoding
+1. Downscaled images (~320x240) - 4x faster encoding
 2. Short, focused prompts - 2x faster generation
 3. Pre-encoded image caching
 4. Emotion-focused analysis
@@ -11,6 +11,8 @@ Target: <500ms per analysis (vs 5000ms baseline)
 """
 
 import sys
+import os
+import re
 import time
 import threading
 import numpy as np
@@ -24,7 +26,17 @@ _tokenizer = None
 _model_lock = threading.Lock()
 
 # Optimal settings discovered through benchmarking
-OPTIMAL_SIZE = (320, 240)  # Width, Height - sweet spot for speed/quality
+# Width, Height - sweet spot for speed/quality, rounded to whole 14px
+# vision-encoder patches (23x17) so no patch straddles the frame edge
+OPTIMAL_SIZE = (322, 238)
+
+# Linear layers eligible for int8 dynamic quantization (KIRA_QUANTIZE=1, CPU only),
+# matched on the last component of the module name
+QUANTIZE_LAYERS = {
+    "attention": ("q_proj", "k_proj", "v_proj", "o_proj", "qkv", "proj", "out_proj"),
+    "ffn": ("up_proj", "gate_proj", "down_proj", "fc1", "fc2"),
+}
+quantize_groups = {"attention", "ffn"}
 
 
 @dataclass
@@ -36,6 +48,15 @@ class FastVLMResult:
     inference_ms: int
 
 
+def _cpu_has_bf16(torch) -> bool:
+    """Whether the CPU has native bf16 matmul instructions (AVX512-BF16 or AMX)."""
+    for name in ("_is_avx512_bf16_supported", "_is_amx_tile_supported"):
+        check = getattr(torch.cpu, name, None)
+        if check is not None and check():
+            return True
+    return False
+
+
 def get_model():
     """Lazy load Moondream model optimized for speed."""
     global _model, _tokenizer
@@ -50,26 +71,96 @@ def get_model():
                 revision = "2025-01-09"
                 
                 device = "mps" if torch.backends.mps.is_available() else "cpu"
-                dtype = torch.float16 if device == "mps" else torch.float32
+                if device == "mps":
+                    dtype = torch.float16
+                elif os.getenv("KIRA_QUANTIZE") != "1" and _cpu_has_bf16(torch):
+                    # bf16 halves fp32's weight traffic without fp16's overflow
+                    # risk; int8 quantization starts from fp32, so not with it
+                    dtype = torch.bfloat16
+                else:
+                    dtype = torch.float32
                 
-                _tokenizer = AutoTokenizer.from_pretrained(
+                # Optional MPS allocator cap (e.g. KIRA_MPS_FRACTION=0.7); it
+                # applies to every model in the process, so off by default
+                mps_fraction = os.getenv("KIRA_MPS_FRACTION")
+                if device == "mps" and mps_fraction:
+                    torch.mps.set_per_process_memory_fraction(float(mps_fraction))
+                
+                tokenizer = AutoTokenizer.from_pretrained(
                     model_id, revision=revision, local_files_only=True
                 )
-                _model = AutoModelForCausalLM.from_pretrained(
+                model = AutoModelForCausalLM.from_pretrained(
                     model_id, revision=revision, trust_remote_code=True,
                     torch_dtype=dtype, local_files_only=True
                 ).to(device)
+                model.eval()
+                
+                # Optional int8 dynamic quantization of the attention/FFN Linears on CPU
+                if os.getenv("KIRA_QUANTIZE") == "1" and device == "cpu":
+                    torch.set_num_threads(os.cpu_count() or 1)
+                    model = _quantize_linears(model, quantize_groups)
+                
+                # Every frame is resized to OPTIMAL_SIZE, so the vision encoder
+                # only ever sees one shape and can be compiled for it
+                if os.getenv("KIRA_COMPILE") == "1" and hasattr(model, "vision_encoder"):
+                    model.vision_encoder.forward = torch.compile(
+                        model.vision_encoder.forward,
+                        mode="reduce-overhead", fullgraph=False, dynamic=False
+                    )
+                    # Lets compiled fp32 matmuls use faster kernels. The
+                    # setting is process-wide, so only when asked to compile
+                    if dtype == torch.float32:
+                        torch.set_float32_matmul_precision("medium")
+                
+                # Warmup at the fixed shape so the first real frame isn't slow
+                with torch.inference_mode():
+                    model.encode_image(Image.new("RGB", OPTIMAL_SIZE))
+                
+                # Publish only once fully prepared: the unlocked check above
+                # must never hand out a half-initialized model
+                _tokenizer = tokenizer
+                _model = model
                 
                 print(f"Moondream2 loaded on {device} (fast mode)", file=sys.stderr)
     return _model, _tokenizer
 
 
+def _preload_model():
+    """Load the model on a daemon thread so the first analyze() doesn't pay for all of it."""
+    def load():
+        try:
+            get_model()
+        except Exception as e:
+            print(f"FastVLM preload failed: {e}", file=sys.stderr)
+    
+    threading.Thread(target=load, daemon=True).start()
+
+
+def _quantize_linears(model, groups):
+    """Quantize the Linear layers in the given QUANTIZE_LAYERS groups to int8."""
+    import torch
+    from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic
+    
+    suffixes = tuple(name for group in groups for name in QUANTIZE_LAYERS[group])
+    qconfig_spec = {
+        name: default_dynamic_qconfig
+        for name, module in model.named_modules()
+        if isinstance(module, torch.nn.Linear) and name.rsplit(".", 1)[-1] in suffixes
+    }
+    if not qconfig_spec:
+        return model
+    
+    model = quantize_dynamic(model, qconfig_spec, dtype=torch.qint8)
+    print(f"Moondream2 quantized to int8 ({len(qconfig_spec)} Linear layers)", file=sys.stderr)
+    return model
+
+
 class FastVLM:
     """
     Fast Vision-Language Model for real-time scene understanding.
     
     Optimizations:
-    - Downscales to 320x240 (4x faster)
+    - Downscales to ~320x240 (4x faster)
     - Uses short prompts (2x faster)
     - Focuses on emotion + activity detection
     
@@ -82,11 +173,42 @@ class FastVLM:
     # Even faster: single-word emotion
     EMOTION_PROMPT = "Person emotion in 1 word:"
     
-    def __init__(self, target_size: Tuple[int, int] = OPTIMAL_SIZE):
+    # Generation caps per prompt: a sentence, and a single word
+    FAST_MAX_TOKENS = 64
+    EMOTION_MAX_TOKENS = 16
+    
+    EMOTIONS = [
+        'happy', 'sad', 'angry', 'surprised', 'fearful', 'disgusted',
+        'neutral', 'calm', 'excited', 'confused', 'tired', 'focused',
+        'joyful', 'anxious', 'relaxed', 'bored', 'curious'
+    ]
+    # All emotions as one whole-word, case-insensitive pattern, so the
+    # response is scanned once instead of once per emotion
+    _EMOTION_RE = re.compile(r"\b(" + "|".join(EMOTIONS) + r")\b", re.IGNORECASE)
+    
+    # Reuse the previous image encoding while the 32x32 grayscale thumbnail
+    # stays within this mean absolute difference (0-255 scale), for at most
+    # CACHE_MAX_AGE seconds; a changed expression barely moves the thumbnail
+    CACHE_THUMB_SIZE = (32, 32)
+    CACHE_MAX_THUMB_DIFF = 4.0
+    CACHE_MAX_AGE = 2.0
+    
+    def __init__(self, target_size: Tuple[int, int] = OPTIMAL_SIZE, prewarm: bool = True):
         self.target_size = target_size
+        # Resize destination reused for every frame (H, W, 3)
+        self._scratch = np.empty((target_size[1], target_size[0], 3), dtype=np.uint8)
         self._last_result: Optional[FastVLMResult] = None
         self._cached_encoding = None
         self._cache_frame_hash = None
+        self._cache_thumb: Optional[np.ndarray] = None
+        self._cache_target_size = target_size
+        self._cache_time = 0.0
+        self._supports_max_tokens = True
+        self._encode_lock = threading.Lock()
+        
+        # Start loading the model now; analyze() waits on the same lock if it's not done
+        if prewarm:
+            _preload_model()
     
     def analyze(self, frame: np.ndarray, include_activity: bool = True) -> Optional[FastVLMResult]:
         """
@@ -104,25 +226,49 @@ class FastVLM:
             
             t0 = time.time()
             
-            # Downscale for speed
-            small = cv2.resize(frame, self.target_size)
-            pil_img = Image.fromarray(small)
-            
             model, tokenizer = get_model()
+            import torch
             
-            # Encode image
-            enc = model.encode_image(pil_img)
-            
-            # Get response
-            if include_activity:
-                response = model.answer_question(enc, self.FAST_PROMPT, tokenizer)
-                # Parse emotion from response
-                emotion = self._extract_emotion(response)
-                activity = response
-            else:
-                # Ultra-fast: just emotion
-                emotion = model.answer_question(enc, self.EMOTION_PROMPT, tokenizer).strip()
-                activity = ""
+            with torch.inference_mode():
+                # The scratch buffer and encoding cache are shared, so frames
+                # from different threads are preprocessed one at a time
+                with self._encode_lock:
+                    if self._scratch.shape[1::-1] != tuple(self.target_size):
+                        self._scratch = np.empty(
+                            (self.target_size[1], self.target_size[0], 3), dtype=np.uint8
+                        )
+                    
+                    # Downscale for speed into the scratch buffer, and wrap it for PIL
+                    # without the extra copy Image.fromarray makes
+                    small = cv2.resize(
+                        frame, self.target_size, dst=self._scratch, interpolation=cv2.INTER_AREA
+                    )
+                    pil_img = Image.frombuffer("RGB", self.target_size, small, "raw", "RGB", 0, 1)
+                    
+                    # Encode image, unless the scene hasn't changed since the last one
+                    thumb = cv2.resize(
+                        cv2.cvtColor(small, cv2.COLOR_RGB2GRAY),
+                        self.CACHE_THUMB_SIZE, interpolation=cv2.INTER_AREA
+                    )
+                    enc = self._cached_encoding_for(thumb)
+                    if enc is None:
+                        enc = model.encode_image(pil_img)
+                        self._store_encoding(thumb, enc)
+                
+                # Get response
+                if include_activity:
+                    response = self._answer(
+                        model, enc, self.FAST_PROMPT, tokenizer, self.FAST_MAX_TOKENS
+                    )
+                    # Parse emotion from response
+                    emotion = self._extract_emotion(response)
+                    activity = response
+                else:
+                    # Ultra-fast: just emotion
+                    emotion = self._answer(
+                        model, enc, self.EMOTION_PROMPT, tokenizer, self.EMOTION_MAX_TOKENS
+                    ).strip()
+                    activity = ""
             
             inference_ms = int((time.time() - t0) * 1000)
             
@@ -140,6 +286,39 @@ class FastVLM:
             print(f"FastVLM error: {e}", file=sys.stderr)
             return None
     
+    def _answer(self, model, enc, prompt: str, tokenizer, max_new_tokens: int) -> str:
+        """Answer prompt about an encoded image, generating at most max_new_tokens."""
+        if self._supports_max_tokens:
+            try:
+                return model.answer_question(
+                    enc, prompt, tokenizer, max_new_tokens=max_new_tokens
+                )
+            except TypeError:
+                # Model revision without the keyword; stop passing it
+                self._supports_max_tokens = False
+        return model.answer_question(enc, prompt, tokenizer)
+    
+    def _cached_encoding_for(self, thumb: np.ndarray):
+        """Return the cached encoding if thumb matches the last encoded frame."""
+        if self._cached_encoding is None or self._cache_target_size != self.target_size:
+            return None
+        if time.time() - self._cache_time >= self.CACHE_MAX_AGE:
+            return None  # Re-encode now and then so a still face is re-read
+        if hash(thumb.tobytes()) == self._cache_frame_hash:
+            return self._cached_encoding
+        # Near-duplicate: sensor noise changes the hash but not the scene
+        if np.abs(thumb.astype(np.int16) - self._cache_thumb).mean() < self.CACHE_MAX_THUMB_DIFF:
+            return self._cached_encoding
+        return None
+    
+    def _store_encoding(self, thumb: np.ndarray, enc):
+        """Remember enc as the encoding of the frame that produced thumb."""
+        self._cached_encoding = enc
+        self._cache_frame_hash = hash(thumb.tobytes())
+        self._cache_thumb = thumb.astype(np.int16)
+        self._cache_target_size = self.target_size
+        self._cache_time = time.time()
+    
     def quick_emotion(self, frame: np.ndarray) -> Tuple[str, int]:
         """
         Ultra-fast emotion-only detection.
@@ -153,21 +332,9 @@ class FastVLM:
         return "unknown", 0
     
     def _extract_emotion(self, text: str) -> str:
-        """Extract emotion keyword from response."""
-        text_lower = text.lower()
-        
-        emotions = [
-            'happy', 'sad', 'angry', 'surprised', 'fearful', 'disgusted',
-            'neutral', 'calm', 'excited', 'confused', 'tired', 'focused',
-            'joyful', 'anxious', 'relaxed', 'bored', 'curious'
-        ]
-        
-        for emotion in emotions:
-            if emotion in text_lower:
-                return emotion
-        
-        # Default
-        return "neutral"
+        """Extract the first emotion keyword mentioned in the response."""
+        match = self._EMOTION_RE.search(text)
+        return match.group(1).lower() if match else "neutral"
 
 
 class HybridVLM:
@@ -177,6 +344,10 @@ class HybridVLM:
     - Every frame: Fast emotion detection (~400ms)
     - Every N frames: Full scene description (~1500ms)
     - On significant change: Full analysis
+    
+    Inference runs on a worker thread. analyze() hands it the latest frame and
+    returns the last result immediately; frames that arrive while the worker
+    is busy replace each other, so only the newest one gets analyzed.
     """
     
     def __init__(self, full_analysis_interval: int = 30):
@@ -184,16 +355,61 @@ class HybridVLM:
         self.full_analysis_interval = full_analysis_interval
         self._frame_count = 0
         self._last_full_analysis: Optional[str] = None
+        
+        # Single-slot mailbox over two reused frame buffers: the worker reads
+        # one while analyze() copies the newest frame into the other
+        self._bufs: list = []
+        self._pending: Optional[int] = None  # Buffer holding the newest frame
+        self._busy: Optional[int] = None  # Buffer the worker is reading
+        self._pending_lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        self._last = self._unknown_result()
+        
+        self._worker = threading.Thread(target=self._loop, daemon=True)
+        self._worker.start()
     
     def analyze(self, frame: np.ndarray) -> dict:
         """
-        Analyze frame with hybrid approach.
+        Queue frame for analysis and return the most recent result.
+        
+        Doesn't wait for inference, so the result describes an earlier frame
+        (or is 'unknown' until the first one finishes).
         
         Returns dict with:
-        - emotion: Current emotion (always fresh)
+        - emotion: Latest emotion
         - activity: Activity description (may be cached)
-        - is_full_analysis: Whether this was a full analysis
+        - is_full_analysis: Whether the latest result was a full analysis
         """
+        with self._pending_lock:
+            if not self._bufs or self._bufs[0].shape != frame.shape:
+                self._bufs = [np.empty(frame.shape, dtype=np.uint8) for _ in range(2)]
+            back = 1 if self._busy == 0 else 0
+            np.copyto(self._bufs[back], frame)
+            self._pending = back
+        self._frame_ready.set()
+        return self._last
+    
+    def _loop(self):
+        """Worker: analyze the newest pending frame whenever there is one."""
+        while True:
+            self._frame_ready.wait()
+            with self._pending_lock:
+                self._busy, self._pending = self._pending, None
+                self._frame_ready.clear()
+                if self._busy is None:
+                    continue
+                frame = self._bufs[self._busy]
+            
+            try:
+                self._last = self._analyze_now(frame)
+            except Exception as e:
+                print(f"HybridVLM error: {e}", file=sys.stderr)
+            finally:
+                with self._pending_lock:
+                    self._busy = None
+    
+    def _analyze_now(self, frame: np.ndarray) -> dict:
+        """Run the hybrid analysis on frame, blocking until it's done."""
         self._frame_count += 1
         
         # Check if we should do full analysis
@@ -202,12 +418,7 @@ class HybridVLM:
         result = self.fast_vlm.analyze(frame, include_activity=do_full)
         
         if result is None:
-            return {
-                'emotion': 'unknown',
-                'activity': self._last_full_analysis or '',
-                'is_full_analysis': False,
-                'inference_ms': 0
-            }
+            return self._unknown_result()
         
         if do_full:
             self._last_full_analysis = result.activity
@@ -218,6 +429,15 @@ class HybridVLM:
             'is_full_analysis': do_full,
             'inference_ms': result.inference_ms
         }
+    
+    def _unknown_result(self) -> dict:
+        """Result used before the first analysis and when one fails."""
+        return {
+            'emotion': 'unknown',
+            'activity': self._last_full_analysis or '',
+            'is_full_analysis': False,
+            'inference_ms': 0
+        }
 
 
 if __name__ == '__main__':
@@ -5,17 +5,44 @@ Only runs expensive VLM inference when the scene actually changes,
 saving 80-90% of compute in static environments.
 """
 
+import os
+import cv2
 import numpy as np
 from typing import Optional, Tuple
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FrameDiffResult:
     """Result of frame difference analysis."""
     changed: bool
     diff_score: float  # 0.0 = identical, 1.0 = completely different
-    motion_regions: int  # Number of regions with motion
+    motion_regions: int  # Number of regions with motion (0 if below motion_threshold)
+
+
+def perceptual_hash(frame: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Difference hash (dHash) of a frame as a hash_size**2-bit integer.
+    
+    The frame is reduced to a hash_size x (hash_size + 1) grid of block
+    means and each bit records whether a block is brighter than its left
+    neighbour. Small amounts of noise or compression leave the hash (nearly)
+    unchanged, so the Hamming distance between two hashes measures how
+    visually different the frames are.
+    """
+    h, w = frame.shape[:2]
+    ys = np.linspace(0, h, hash_size + 1, dtype=np.intp)
+    xs = np.linspace(0, w, hash_size + 2, dtype=np.intp)
+    
+    # Block sums straight from uint8 pixels, without a float copy of the frame
+    blocks = np.add.reduceat(frame, ys[:-1], axis=0, dtype=np.uint32)
+    blocks = np.add.reduceat(blocks, xs[:-1], axis=1)
+    if blocks.ndim == 3:
+        blocks = blocks.sum(axis=2)
+    means = blocks / np.outer(np.diff(ys), np.diff(xs))
+    
+    bits = means[:, 1:] > means[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
 
 
 class FrameDifferencer:
@@ -34,55 +61,69 @@ class FrameDifferencer:
         motion_threshold: float = 0.02,  # Sensitivity for motion detection
         min_frames_between_vlm: int = 5,  # Minimum frames before re-analyzing
         downsample_factor: int = 4,  # Downsample for faster comparison
+        bgr: bool = False,  # Frames are BGR, as read from OpenCV, rather than RGB
     ):
         self.change_threshold = change_threshold
         self.motion_threshold = motion_threshold
+        # Per-pixel motion threshold on the uint8 difference image; a pixel
+        # moves when its difference exceeds this (same as > motion_threshold * 255)
+        self._motion_thr_u8 = int(motion_threshold * 255)
         self.min_frames_between_vlm = min_frames_between_vlm
         self.downsample_factor = downsample_factor
+        # Comparisons only need grayscale, so BGR frames are converted
+        # directly instead of the caller swapping channels first
+        self._gray_code = cv2.COLOR_BGR2GRAY if bgr else cv2.COLOR_RGB2GRAY
         
-        self._last_frame: Optional[np.ndarray] = None
-        self._last_vlm_frame: Optional[np.ndarray] = None
+        # Downsampled grayscale (uint8) of the frame the VLM last ran on
+        self._last_vlm_frame_gray: Optional[np.ndarray] = None
         self._frames_since_vlm = 0
+        
+        # Per-frame work buffers, allocated on the first frame (and when the
+        # frame size changes) and reused after that
+        self._scratch_small: Optional[np.ndarray] = None
+        self._scratch_gray_curr: Optional[np.ndarray] = None
+        self._scratch_diff: Optional[np.ndarray] = None
+        self._scratch_mask: Optional[np.ndarray] = None
+        
+        # Optionally downsample on an OpenCL device. Only the full-resolution
+        # steps move there: the downsampled comparison is too small to be
+        # worth a transfer
+        self._use_opencl = os.getenv("KIRA_OPENCL") == "1" and cv2.ocl.haveOpenCL()
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
     
     def should_run_vlm(self, frame: np.ndarray) -> Tuple[bool, FrameDiffResult]:
         """
         Determine if VLM should run on this frame.
         
         Args:
-            frame: RGB image as numpy array (H, W, 3)
+            frame: RGB (or BGR, see bgr) image as numpy array (H, W, 3). Only read: the
+                differencer keeps its own grayscale copies, so the caller
+                may reuse the buffer afterwards.
             
         Returns:
             Tuple of (should_run, diff_result)
         """
         self._frames_since_vlm += 1
         
-        # Downsample for faster comparison
-        small_frame = self._downsample(frame)
+        self._ensure_scratch(frame.shape)
         
-        # First frame always triggers VLM
-        if self._last_frame is None:
-            self._last_frame = small_frame.copy()
-            self._last_vlm_frame = small_frame.copy()
+        # Downsample for faster comparison; all comparisons use grayscale
+        if self._use_opencl:
+            gray = self._to_gray_opencl(frame)
+        else:
+            gray = self._to_gray(self._downsample(frame))
+        
+        # First frame (or a new frame size) always triggers VLM
+        if self._last_vlm_frame_gray is None:
+            self._keep_as_vlm_frame()
             self._frames_since_vlm = 0
             return True, FrameDiffResult(changed=True, diff_score=1.0, motion_regions=0)
         
-        # Calculate difference from last frame (motion detection)
-        diff_from_last = self._calculate_diff(self._last_frame, small_frame)
-        
         # Calculate difference from last VLM frame (scene change detection)
-        diff_from_vlm = self._calculate_diff(self._last_vlm_frame, small_frame)
-        
-        # Update last frame
-        self._last_frame = small_frame.copy()
-        
-        # Count motion regions
-        motion_regions = self._count_motion_regions(self._last_vlm_frame, small_frame)
-        
-        result = FrameDiffResult(
-            changed=diff_from_vlm.changed,
-            diff_score=diff_from_vlm.diff_score,
-            motion_regions=motion_regions
-        )
+        # and count motion regions, from the same difference image
+        diff_from_vlm = self._analyze(self._last_vlm_frame_gray, gray)
+        motion_regions = diff_from_vlm.motion_regions
         
         # Decision logic
         should_run = False
@@ -101,10 +142,10 @@ class FrameDifferencer:
             should_run = True
         
         if should_run:
-            self._last_vlm_frame = small_frame.copy()
+            self._keep_as_vlm_frame()
             self._frames_since_vlm = 0
         
-        return should_run, result
+        return should_run, diff_from_vlm
     
     def _downsample(self, frame: np.ndarray) -> np.ndarray:
         """Downsample frame for faster comparison."""
@@ -115,68 +156,111 @@ class FrameDifferencer:
         new_h = h // self.downsample_factor
         new_w = w // self.downsample_factor
         
-        # Simple area averaging (faster than cv2.resize)
-        reshaped = frame[:new_h * self.downsample_factor, :new_w * self.downsample_factor]
-        reshaped = reshaped.reshape(new_h, self.downsample_factor, new_w, self.downsample_factor, 3)
-        return reshaped.mean(axis=(1, 3)).astype(np.uint8)
+        # Block averaging: at an integer factor INTER_AREA averages each
+        # factor x factor block in uint8, with no float copy of the frame
+        cropped = frame[:new_h * self.downsample_factor, :new_w * self.downsample_factor]
+        return cv2.resize(
+            cropped, (new_w, new_h), dst=self._scratch_small, interpolation=cv2.INTER_AREA
+        )
+    
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a color frame to uint8 grayscale, into the current-frame buffer."""
+        return cv2.cvtColor(frame, self._gray_code, dst=self._scratch_gray_curr)
     
-    def _calculate_diff(self, frame1: np.ndarray, frame2: np.ndarray) -> FrameDiffResult:
-        """Calculate difference between two frames."""
-        # Convert to grayscale for comparison
-        gray1 = frame1.mean(axis=2)
-        gray2 = frame2.mean(axis=2)
+    def _to_gray_opencl(self, frame: np.ndarray) -> np.ndarray:
+        """Downsample and convert to grayscale via UMat, into the current-frame buffer."""
+        h, w = self._scratch_gray_curr.shape
+        f = max(self.downsample_factor, 1)
+        small = cv2.UMat(np.ascontiguousarray(frame[:h * f, :w * f]))
+        if f > 1:
+            small = cv2.resize(small, (w, h), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, self._gray_code)
+        np.copyto(self._scratch_gray_curr, gray.get())
+        return self._scratch_gray_curr
+    
+    def _ensure_scratch(self, frame_shape: Tuple[int, ...]):
+        """(Re)allocate the work buffers for frames of frame_shape."""
+        h, w = frame_shape[:2]
+        if self.downsample_factor > 1:
+            h //= self.downsample_factor
+            w //= self.downsample_factor
         
-        # Calculate absolute difference
-        diff = np.abs(gray1.astype(np.float32) - gray2.astype(np.float32))
+        if self._scratch_gray_curr is not None and self._scratch_gray_curr.shape == (h, w):
+            return
         
-        # Normalize to 0-1
-        diff_score = diff.mean() / 255.0
+        self._scratch_small = np.empty((h, w, 3), dtype=np.uint8)
+        self._scratch_gray_curr = np.empty((h, w), dtype=np.uint8)
+        self._scratch_diff = np.empty((h, w), dtype=np.uint8)
+        self._scratch_mask = np.empty((h, w), dtype=np.uint8)
+        # The old reference frame can't be compared against the new size
+        self._last_vlm_frame_gray = None
+    
+    def _keep_as_vlm_frame(self):
+        """Make the current grayscale frame the VLM reference, swapping buffers."""
+        if self._last_vlm_frame_gray is None:
+            self._last_vlm_frame_gray = np.empty_like(self._scratch_gray_curr)
+        self._last_vlm_frame_gray, self._scratch_gray_curr = (
+            self._scratch_gray_curr, self._last_vlm_frame_gray
+        )
+    
+    def _analyze(self, gray1: np.ndarray, gray2: np.ndarray) -> FrameDiffResult:
+        """Calculate difference and motion regions between two grayscale frames."""
+        diff = cv2.absdiff(gray1, gray2, dst=self._scratch_diff)
+        diff_score = cv2.mean(diff)[0] / 255.0
         
-        changed = diff_score > self.change_threshold
+        # Motion regions only matter above motion_threshold, so static
+        # scenes stop after the mean
+        motion_regions = 0
+        if diff_score > self.motion_threshold:
+            motion_regions = self._count_motion_regions(diff)
         
-        return FrameDiffResult(changed=changed, diff_score=diff_score, motion_regions=0)
+        return FrameDiffResult(
+            changed=diff_score > self.change_threshold,
+            diff_score=diff_score,
+            motion_regions=motion_regions
+        )
     
-    def _count_motion_regions(self, frame1: np.ndarray, frame2: np.ndarray) -> int:
-        """Count distinct motion regions using simple connected components."""
-        gray1 = frame1.mean(axis=2)
-        gray2 = frame2.mean(axis=2)
-        
-        diff = np.abs(gray1.astype(np.float32) - gray2.astype(np.float32))
+    def _count_motion_regions(self, diff: np.ndarray) -> int:
+        """
+        Count motion regions in an absolute grayscale difference.
         
+        A region is a cell of an 8x8 grid with over 10% moving pixels. This
+        is grid occupancy, not connected components: scattered noise pixels
+        don't add regions, so the ">= 3 regions" trigger stays stable.
+        """
         # Threshold to binary motion mask
-        threshold = self.motion_threshold * 255
-        motion_mask = (diff > threshold).astype(np.uint8)
+        _, motion_mask = cv2.threshold(
+            diff, self._motion_thr_u8, 1, cv2.THRESH_BINARY, dst=self._scratch_mask
+        )
         
         # Simple region counting using grid
         grid_size = 8
         h, w = motion_mask.shape
         cell_h, cell_w = h // grid_size, w // grid_size
         
-        active_cells = 0
-        for i in range(grid_size):
-            for j in range(grid_size):
-                cell = motion_mask[i*cell_h:(i+1)*cell_h, j*cell_w:(j+1)*cell_w]
-                if cell.mean() > 0.1:  # 10% of cell has motion
-                    active_cells += 1
+        # Moving pixels per cell in one reduction over a (row, y, col, x) view
+        cells = motion_mask[:grid_size * cell_h, :grid_size * cell_w]
+        cells = cells.reshape(grid_size, cell_h, grid_size, cell_w)
+        moving = cells.sum(axis=(1, 3), dtype=np.uint32)
         
-        return active_cells
+        # A cell is active when over 10% of it has motion
+        return int((moving * 10 > cell_h * cell_w).sum())
     
     def reset(self):
         """Reset state."""
-        self._last_frame = None
-        self._last_vlm_frame = None
+        self._last_vlm_frame_gray = None
         self._frames_since_vlm = 0
 
 
 if __name__ == '__main__':
-    import cv2
     import time
     
     print("Testing frame differencing...")
     
     differ = FrameDifferencer(
         change_threshold=0.05,
-        min_frames_between_vlm=10
+        min_frames_between_vlm=10,
+        bgr=True
     )
     
     cap = cv2.VideoCapture(0)
@@ -196,8 +280,7 @@ if __name__ == '__main__':
         if not ret:
             continue
         
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        should_run, result = differ.should_run_vlm(frame_rgb)
+        should_run, result = differ.should_run_vlm(frame)
         
         total_frames += 1
         if should_run:
@@ -6,14 +6,28 @@ Runs at 2Hz to provide scene descriptions.
 """
 
 import sys
+import os
 import json
 import time
 import threading
-import queue
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
 from typing import Optional
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Handle both direct execution and module import
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from vlm.frame_diff import perceptual_hash
+else:
+    from .frame_diff import perceptual_hash
+
 # Lazy imports
 _model = None
 _tokenizer = None
@@ -48,16 +62,26 @@ def get_model():
                     torch_dtype=dtype,
                     local_files_only=True,
                 ).to(device)
+                # Inference only: disables dropout and training-mode bookkeeping
+                _model.eval()
+                
+                # Optional int8 dynamic quantization for CPU runs (MPS has no qint8 kernels)
+                if os.getenv("KIRA_QUANTIZE") == "1" and device == "cpu":
+                    _model = torch.ao.quantization.quantize_dynamic(
+                        _model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    print("Moondream2 quantized to int8", file=sys.stderr)
                 
                 print(f"Moondream2 loaded on {device}", file=sys.stderr)
     return _model, _tokenizer
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SceneDescription:
     description: str
     timestamp: float
     inference_ms: int
+    cached: bool = False  # Served from the perceptual-hash cache
 
 
 class MoondreamVLM:
@@ -65,10 +89,20 @@ class MoondreamVLM:
     
     DEFAULT_PROMPT = "Describe what you see in this image. Focus on any people, their expressions, posture, and what they appear to be doing."
     
+    CACHE_SIZE = 16  # Recent frames whose descriptions are kept
+    CACHE_MAX_DISTANCE = 2  # Max differing hash bits to count as the same frame
+    
+    # Moondream encodes 378x378 crops; frames are downscaled so their longer
+    # side is at most two crops before they reach the model
+    MAX_INPUT_SIDE = 756
+    
     def __init__(self, prompt: Optional[str] = None):
         self.prompt = prompt or self.DEFAULT_PROMPT
         self._last_description = None
         self._last_description_time = 0
+        self._last_words: frozenset = frozenset()  # has_changed() word set of _last_description
+        # perceptual hash -> SceneDescription, least recently used first
+        self._desc_cache: "OrderedDict[int, SceneDescription]" = OrderedDict()
         
     def describe(self, image: np.ndarray) -> Optional[SceneDescription]:
         """
@@ -92,18 +126,44 @@ class MoondreamVLM:
                 print(f"Invalid image shape: {image.shape}, expected (H, W, 3)", file=sys.stderr)
                 return None
             
+            # Near-identical frames reuse the previous description
+            frame_hash = perceptual_hash(image)
+            cached = self._cache_lookup(frame_hash)
+            if cached is not None:
+                result = replace(cached, timestamp=time.time(), cached=True)
+                self._remember(result)
+                return result
+            
             model, tokenizer = get_model()
+            import torch
+            import cv2
             
-            # Convert numpy to PIL
+            # Downscale large frames on the CPU (cheap SIMD area resize)
+            # rather than shipping full resolution to the encoder
+            h, w = image.shape[:2]
+            if max(h, w) > self.MAX_INPUT_SIDE:
+                scale = self.MAX_INPUT_SIDE / max(h, w)
+                image = cv2.resize(
+                    image, (round(w * scale), round(h * scale)),
+                    interpolation=cv2.INTER_AREA
+                )
+
+            # Convert numpy to PIL. Moondream moves the image to the device
+            # itself, so the only host-side copy we control is this one:
+            # a contiguous uint8 frame is read straight from its buffer
+            # instead of going through an intermediate tobytes() copy.
+            image = np.ascontiguousarray(image, dtype=np.uint8)
             pil_image = Image.fromarray(image)
             
             t0 = time.time()
             
-            # Encode image
-            enc_image = model.encode_image(pil_image)
-            
-            # Generate description
-            description = model.answer_question(enc_image, self.prompt, tokenizer)
+            # No autograd bookkeeping for either step
+            with torch.inference_mode():
+                # Encode image
+                enc_image = model.encode_image(pil_image)
+                
+                # Generate description
+                description = model.answer_question(enc_image, self.prompt, tokenizer)
             
             inference_ms = int((time.time() - t0) * 1000)
             
@@ -113,8 +173,11 @@ class MoondreamVLM:
                 inference_ms=inference_ms
             )
             
-            self._last_description = result
-            self._last_description_time = time.time()
+            self._remember(result)
+            
+            self._desc_cache[frame_hash] = result
+            if len(self._desc_cache) > self.CACHE_SIZE:
+                self._desc_cache.popitem(last=False)
             
             return result
             
@@ -122,13 +185,29 @@ class MoondreamVLM:
             print(f"VLM describe error: {e}", file=sys.stderr)
             return None
     
+    def _cache_lookup(self, frame_hash: int) -> Optional[SceneDescription]:
+        """Find a cached description for a frame within CACHE_MAX_DISTANCE bits."""
+        for key, description in self._desc_cache.items():
+            if (key ^ frame_hash).bit_count() <= self.CACHE_MAX_DISTANCE:
+                self._desc_cache.move_to_end(key)
+                return description
+        return None
+    
+    def _remember(self, result: SceneDescription):
+        """Make result the last description, tokenizing it once for has_changed()."""
+        last = self._last_description
+        if last is None or result.description != last.description:
+            self._last_words = frozenset(result.description.lower().split())
+        self._last_description = result
+        self._last_description_time = result.timestamp
+    
     def has_changed(self, new_description: str, threshold: float = 0.3) -> bool:
         """Check if the scene has meaningfully changed from the last description."""
         if self._last_description is None:
             return True
             
         # Simple heuristic: check word overlap
-        old_words = set(self._last_description.description.lower().split())
+        old_words = self._last_words
         new_words = set(new_description.lower().split())
         
         if not old_words or not new_words:
@@ -146,7 +225,10 @@ class VLMService:
         self.interval = 1.0 / hz
         self.vlm = MoondreamVLM(prompt=prompt)
         self._running = False
-        self._frame_queue = queue.Queue(maxsize=1)  # Only keep latest frame
+        # Only keep the latest frame
+        self._latest_frame: Optional[np.ndarray] = None
+        self._frame_lock = threading.Lock()
+        self._frame_event = threading.Event()
         self._callbacks = []
         
     def on_description(self, callback):
@@ -155,15 +237,10 @@ class VLMService:
         
     def submit_frame(self, frame: np.ndarray):
         """Submit a new frame for processing."""
-        try:
-            # Replace any existing frame (we only care about the latest)
-            try:
-                self._frame_queue.get_nowait()
-            except queue.Empty:
-                pass
-            self._frame_queue.put_nowait(frame)
-        except queue.Full:
-            pass
+        # Replace any existing frame (we only care about the latest)
+        with self._frame_lock:
+            self._latest_frame = frame
+        self._frame_event.set()
             
     def start(self):
         """Start the VLM processing loop."""
@@ -178,20 +255,33 @@ class VLMService:
         
     def _process_loop(self):
         """Main processing loop."""
+        # Load the model now rather than on the first frame, so the first
+        # description isn't delayed by the load
+        try:
+            get_model()
+        except Exception as e:
+            print(f"VLM model load error: {e}", file=sys.stderr)
+        
         last_process_time = 0
         
         while self._running:
-            try:
-                frame = self._frame_queue.get(timeout=0.1)
-            except queue.Empty:
+            # Rate limit: sleep until the next slot instead of taking (and
+            # dropping) frames early; frames submitted meanwhile just
+            # replace each other, so the newest one is processed
+            delay = last_process_time + self.interval - time.time()
+            if delay > 0:
+                time.sleep(min(delay, 0.1))
                 continue
-                
-            # Rate limit
-            now = time.time()
-            if now - last_process_time < self.interval:
+            
+            if not self._frame_event.wait(timeout=0.1):
+                continue
+            with self._frame_lock:
+                frame, self._latest_frame = self._latest_frame, None
+                self._frame_event.clear()
+            if frame is None:
                 continue
                 
-            last_process_time = now
+            last_process_time = time.time()
             
             try:
                 result = self.vlm.describe(frame)
@@ -211,17 +301,39 @@ class VLMService:
                 print(f"VLM error: {e}", file=sys.stderr)
 
 
+def _parse_request(line: bytes) -> dict:
+    """Parse one JSON request line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _send(message: dict):
+    """Write one JSON response line to stdout."""
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(message) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(message), flush=True)
+
+
 def run_service():
-    """Run as a stdin/stdout service."""
+    """
+    Run as a stdin/stdout service.
+    
+    Prefer 'image_path' over 'image_base64' in requests: reading the file
+    skips decoding a large base64 string.
+    """
     import cv2
     
     vlm = MoondreamVLM()
     
-    print(json.dumps({'type': 'ready'}), flush=True)
+    _send({'type': 'ready'})
     
-    for line in sys.stdin:
+    # Raw bytes lines: the JSON parser takes them without a str decode
+    for line in sys.stdin.buffer:
         try:
-            request = json.loads(line.strip())
+            request = _parse_request(line)
             
             if request.get('command') == 'describe':
                 # Expect base64 image or file path
@@ -235,28 +347,28 @@ def run_service():
                     image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
                     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
                 else:
-                    print(json.dumps({'type': 'error', 'message': 'No image provided'}), flush=True)
+                    _send({'type': 'error', 'message': 'No image provided'})
                     continue
                     
                 result = vlm.describe(image)
                 
                 if result is None:
-                    print(json.dumps({'type': 'error', 'message': 'Failed to describe image'}), flush=True)
+                    _send({'type': 'error', 'message': 'Failed to describe image'})
                     continue
                 
-                print(json.dumps({
+                _send({
                     'type': 'description',
                     'description': result.description,
                     'inference_ms': result.inference_ms
-                }), flush=True)
+                })
                 
             elif request.get('command') == 'stop':
                 break
                 
         except json.JSONDecodeError as e:
-            print(json.dumps({'type': 'error', 'message': str(e)}), flush=True)
+            _send({'type': 'error', 'message': str(e)})
         except Exception as e:
-            print(json.dumps({'type': 'error', 'message': str(e)}), flush=True)
+            _send({'type': 'error', 'message': str(e)})
 
 
 if __name__ == '__main__':
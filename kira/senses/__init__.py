@@ -26,6 +26,7 @@ from .protocol import (
     emit_ready,
     emit_error,
     log,
+    debug,
     PRIORITY_VOICE,
     PRIORITY_VISUAL,
     PRIORITY_SCREEN,
@@ -43,6 +44,7 @@ __all__ = [
     "emit_ready",
     "emit_error",
     "log",
+    "debug",
     "PRIORITY_VOICE",
     "PRIORITY_VISUAL",
     "PRIORITY_SCREEN",
@@ -39,6 +39,7 @@ try:
         emit_error,
         emit_status,
         log,
+        debug,
         read_commands,
         PRIORITY_VISUAL,
         PRIORITY_VOICE,
@@ -53,6 +54,7 @@ except ImportError:
         emit_error,
         emit_status,
         log,
+        debug,
         read_commands,
         PRIORITY_VISUAL,
         PRIORITY_VOICE,
@@ -150,7 +152,7 @@ class BaseSense(ABC):
 
     def _handle_command(self, cmd: Command):
         """Route commands to appropriate handlers."""
-        log(f"[{self.name}] Command: {cmd.command}")
+        debug("[%s] Command: %s", self.name, cmd.command)
 
         if cmd.command == "start":
             if not self.running:
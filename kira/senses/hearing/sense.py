@@ -21,7 +21,8 @@ class HearingSense(BaseSense):
     Microphone-based perception using STT.
 
     Configuration options:
-        model_size: Whisper model size (default: "base")
+        model_size: Whisper model size (default: "base"); "distil-small.en"
+            is about twice as fast for English-only use
         vad_threshold: VAD sensitivity 0-1 (default: 0.5)
     """
 
@@ -49,6 +50,7 @@ class HearingSense(BaseSense):
             on_transcription=self._on_transcription,
             on_interrupt=self._on_interrupt,
         )
+        self._transcriber.warmup()
         log(f"[{self.name}] STT ready")
 
     def _start(self):
@@ -14,11 +14,19 @@ import time
 
 _vad_model = None
 _vad_utils = None
+_vad_session = None
 _model_lock = threading.Lock()
+_session_lock = threading.Lock()
 
 SAMPLE_RATE = 16000
 CHUNK_MS = 32
 CHUNK_SAMPLES = int(SAMPLE_RATE * CHUNK_MS / 1000)  # 512 samples
+MAX_SPEECH_SECONDS = 30  # Longest segment we buffer (Whisper's window size)
+CONTEXT_SAMPLES = 64  # Trailing samples of the previous chunk Silero sees at 16kHz
+
+# Outside speech, chunks whose peak stays under max(noise floor * 3, this)
+# are treated as silence without running Silero
+MIN_GATE_PEAK = 0.005
 
 
 def get_vad_model():
@@ -42,6 +50,48 @@ def get_vad_model():
     return _vad_model, _vad_utils
 
 
+def _find_onnx_model() -> Optional[str]:
+    """Path of silero_vad.onnx from the silero-vad package, if it's installed."""
+    try:
+        from importlib.resources import files
+
+        path = files("silero_vad.data") / "silero_vad.onnx"
+    except ImportError:
+        return None
+    return str(path) if path.is_file() else None
+
+
+def get_vad_session():
+    """
+    Lazy load Silero VAD as a bare onnxruntime session.
+
+    Returns None (use get_vad_model() instead) if onnxruntime or the
+    silero-vad model file isn't available.
+    """
+    global _vad_session
+    if _vad_session is None:
+        with _session_lock:
+            if _vad_session is None:
+                path = _find_onnx_model()
+                try:
+                    import onnxruntime as ort
+                except ImportError:
+                    path = None
+
+                if path is None:
+                    _vad_session = False
+                else:
+                    options = ort.SessionOptions()
+                    # One 512-sample chunk is far too small to split across threads
+                    options.intra_op_num_threads = 1
+                    options.inter_op_num_threads = 1
+                    _vad_session = ort.InferenceSession(
+                        path, sess_options=options, providers=["CPUExecutionProvider"]
+                    )
+                    print("Silero VAD loaded (onnxruntime)", file=sys.stderr)
+    return _vad_session or None
+
+
 @dataclass
 class SpeechSegment:
     """A detected speech segment."""
@@ -73,34 +123,84 @@ class SileroVAD:
         self.speech_pad_samples = int(SAMPLE_RATE * speech_pad_ms / 1000)
         self.on_speech_segment = on_speech_segment
 
-        self._speech_buffer: List[np.ndarray] = []
+        # Preallocated once; chunks are written at _buffered_samples
+        self._speech_buffer = np.zeros(
+            SAMPLE_RATE * MAX_SPEECH_SECONDS, dtype=np.float32
+        )
+        self._buffered_samples = 0
         self._silence_samples = 0
         self._speech_samples = 0
         self._in_speech = False
         self._speech_start_time: Optional[float] = None
 
-    def process_chunk(self, audio_chunk: np.ndarray) -> Optional[float]:
+        # Recurrent state and input buffer for the onnxruntime session:
+        # [previous chunk's last CONTEXT_SAMPLES | current chunk]
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+        self._sr = np.array(SAMPLE_RATE, dtype=np.int64)
+        self._input = np.zeros((1, CONTEXT_SAMPLES + CHUNK_SAMPLES), dtype=np.float32)
+
+        # Running peak level of non-speech chunks
+        self._noise_floor = 0.0
+
+        # Resolved on the first Silero call, so later chunks skip the
+        # module-level lazy-load checks (and the torch import)
+        self._session = None  # onnxruntime session, False if unavailable
+        self._model = None  # torch.hub fallback model
+        self._from_numpy = None  # torch.from_numpy, for the fallback
+
+    def process_chunks(self, chunks: List[np.ndarray]):
+        """
+        Process several consecutive CHUNK_SAMPLES chunks, e.g. a backlog.
+
+        Silero's recurrent state has to step through the chunks in order, but
+        the noise gate's peak levels are computed for all of them at once.
+        """
+        if len(chunks) == 1 or any(len(c) != CHUNK_SAMPLES for c in chunks):
+            for chunk in chunks:
+                self.process_chunk(chunk)
+            return
+
+        peaks = np.abs(np.stack(chunks)).max(axis=1).tolist()
+        for chunk, peak in zip(chunks, peaks):
+            self.process_chunk(chunk, peak)
+
+    def process_chunk(
+        self, audio_chunk: np.ndarray, peak: Optional[float] = None
+    ) -> Optional[float]:
         """
         Process an audio chunk through VAD.
 
         Args:
             audio_chunk: Audio samples (float32, 16kHz)
+            peak: Precomputed max(abs(audio_chunk[:CHUNK_SAMPLES])), if known
 
         Returns:
             Speech probability (0-1) or None if chunk too small
         """
-        import torch
-
-        model, _ = get_vad_model()
-
         if len(audio_chunk) < CHUNK_SAMPLES:
             return None
 
-        audio_tensor = torch.from_numpy(audio_chunk[:CHUNK_SAMPLES].astype(np.float32))
-        speech_prob = model(audio_tensor, SAMPLE_RATE).item()
+        chunk = audio_chunk[:CHUNK_SAMPLES]
+        if not self._in_speech:
+            # Cheap gate: a chunk barely above the room's noise can't start speech
+            if peak is None:
+                peak = float(np.max(np.abs(chunk), initial=0.0))
+            self._noise_floor = 0.95 * self._noise_floor + 0.05 * peak
+            if peak < max(self._noise_floor * 3, MIN_GATE_PEAK):
+                self._input[0, :CONTEXT_SAMPLES] = chunk[-CONTEXT_SAMPLES:]
+                return 0.0
+
+        speech_prob = self._speech_prob(chunk)
 
         is_speech = speech_prob >= self.threshold
 
+        # Flush before the buffer overflows
+        if (
+            self._in_speech
+            and self._buffered_samples + len(audio_chunk) > len(self._speech_buffer)
+        ):
+            self._emit_segment()
+
         if is_speech:
             if not self._in_speech:
                 self._in_speech = True
@@ -108,13 +208,13 @@ class SileroVAD:
                 self._speech_samples = 0
                 self._silence_samples = 0
 
-            self._speech_buffer.append(audio_chunk.copy())
+            self._buffer_audio(audio_chunk)
             self._speech_samples += len(audio_chunk)
             self._silence_samples = 0
 
         else:
             if self._in_speech:
-                self._speech_buffer.append(audio_chunk.copy())
+                self._buffer_audio(audio_chunk)
                 self._silence_samples += len(audio_chunk)
 
                 if self._silence_samples >= self.min_silence_samples:
@@ -122,10 +222,39 @@ class SileroVAD:
 
         return speech_prob
 
+    def _speech_prob(self, chunk: np.ndarray) -> float:
+        """Run Silero on one CHUNK_SAMPLES chunk."""
+        session = self._session
+        if session is None:
+            session = self._session = get_vad_session() or False
+        if session is False:
+            if self._model is None:
+                import torch
+
+                self._from_numpy = torch.from_numpy
+                self._model, _ = get_vad_model()
+            tensor = self._from_numpy(chunk.astype(np.float32))
+            return self._model(tensor, SAMPLE_RATE).item()
+
+        # Same inputs the Silero ONNX wrapper builds, without torch tensors
+        self._input[0, CONTEXT_SAMPLES:] = chunk
+        out, self._state = session.run(
+            None, {"input": self._input, "state": self._state, "sr": self._sr}
+        )
+        self._input[0, :CONTEXT_SAMPLES] = self._input[0, -CONTEXT_SAMPLES:]
+        return float(out[0, 0])
+
+    def _buffer_audio(self, audio_chunk: np.ndarray):
+        """Append a chunk to the preallocated speech buffer."""
+        end = self._buffered_samples + len(audio_chunk)
+        self._speech_buffer[self._buffered_samples : end] = audio_chunk
+        self._buffered_samples = end
+
     def _emit_segment(self):
         """Emit the current speech segment if valid."""
-        if self._speech_samples >= self.min_speech_samples and self._speech_buffer:
-            audio = np.concatenate(self._speech_buffer)
+        if self._speech_samples >= self.min_speech_samples and self._buffered_samples:
+            # Copy out of the buffer, which is reused for the next segment
+            audio = self._speech_buffer[: self._buffered_samples].copy()
 
             end_time = time.time()
             start_time = self._speech_start_time or end_time
@@ -145,9 +274,17 @@ class SileroVAD:
 
         self.reset()
 
+    def warmup(self, runs: int = 3):
+        """Load the model and run it on silence, then clear its recurrent state."""
+        silence = np.zeros(CHUNK_SAMPLES, dtype=np.float32)
+        for _ in range(runs):
+            self._speech_prob(silence)
+        self._state[:] = 0
+        self._input[:] = 0
+
     def reset(self):
         """Reset state - clears buffer and flags."""
-        self._speech_buffer = []
+        self._buffered_samples = 0
         self._silence_samples = 0
         self._speech_samples = 0
         self._in_speech = False
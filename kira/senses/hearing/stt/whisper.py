@@ -9,21 +9,37 @@ a class with the same interface as FastWhisperTranscriber.
 """
 
 import sys
+import os
+import re
+import bisect
 import numpy as np
 import threading
 import queue
 import time
 from dataclasses import dataclass
-from typing import Optional, Callable
+from typing import Optional, Callable, List, Tuple
 
 from .vad import SileroVAD, SpeechSegment, SAMPLE_RATE, CHUNK_SAMPLES
 
 _model = None
 _model_lock = threading.Lock()
 
+# CTranslate2 defaults to 4 threads whatever the machine; use half the cores
+# (leaving the rest to the VAD and the other senses), at least one
+CPU_THREADS = max(1, (os.cpu_count() or 2) // 2)
+
+# Speech segments that queue up while one is being transcribed are
+# transcribed together, up to this many per pass
+MAX_BATCH_SEGMENTS = 4
+
 
 def get_model(model_size: str = "base"):
-    """Lazy load faster-whisper model."""
+    """
+    Lazy load faster-whisper model.
+
+    model_size is any faster-whisper model name, including the English-only
+    Distil-Whisper conversions such as "distil-small.en".
+    """
     global _model
     if _model is None:
         with _model_lock:
@@ -31,7 +47,13 @@ def get_model(model_size: str = "base"):
                 print(f"Loading faster-whisper {model_size}...", file=sys.stderr)
                 from faster_whisper import WhisperModel
 
-                _model = WhisperModel(model_size, device="cpu", compute_type="int8")
+                _model = WhisperModel(
+                    model_size,
+                    device="cpu",
+                    compute_type="int8",
+                    cpu_threads=CPU_THREADS,
+                    num_workers=1,
+                )
                 print(f"faster-whisper {model_size} loaded", file=sys.stderr)
     return _model
 
@@ -59,31 +81,43 @@ HALLUCINATION_PATTERNS = [
 ]
 
 
+# Compiled once: exact matches, substrings for the longer patterns, and the
+# shapes of junk output
+_HALLUCINATION_SET = frozenset(HALLUCINATION_PATTERNS)
+_HALLUCINATION_RE = re.compile(
+    "|".join(re.escape(p) for p in HALLUCINATION_PATTERNS if len(p) > 5)
+)
+_PUNCTUATION_ONLY_RE = re.compile(r"^[\s\.\,\!\?\-]+$")
+_REPEATED_WORD_RE = re.compile(r"\b(\w+)(?:\s+\1){2,}\b")
+_REPEATED_LETTER_RE = re.compile(r"^(\w)(?:\s+\1)+\s*$")
+_REPEATED_CHARS_RE = re.compile(r"(.{1,3})\1{3,}")
+
+
 def is_hallucination(text: str) -> bool:
     """Detect common Whisper hallucinations."""
-    import re
-
-    text = text.strip().lower()
+    text = text.strip()
 
     if len(text) < 3:
         return True
 
-    if re.match(r"^[\s\.\,\!\?\-]+$", text):
+    # Exact matches ("you", "the") are the most common case; check them first
+    text = text.lower()
+    if text in _HALLUCINATION_SET:
         return True
 
-    for pattern in HALLUCINATION_PATTERNS:
-        if text == pattern:
-            return True
-        if len(pattern) > 5 and pattern in text:
-            return True
+    if _PUNCTUATION_ONLY_RE.match(text):
+        return True
+
+    if _HALLUCINATION_RE.search(text):
+        return True
 
-    if re.search(r"\b(\w+)(?:\s+\1){2,}\b", text):
+    if _REPEATED_WORD_RE.search(text):
         return True
 
-    if re.match(r"^(\w)(?:\s+\1)+\s*$", text):
+    if _REPEATED_LETTER_RE.match(text):
         return True
 
-    if re.search(r"(.{1,3})\1{3,}", text):
+    if _REPEATED_CHARS_RE.search(text):
         return True
 
     return False
@@ -97,6 +131,10 @@ class FastWhisperTranscriber:
     """
 
     INTERRUPT_KEYWORDS = ["kira", "stop", "wait", "quiet"]
+    # Whole words only, as in the perception transcriber: "waiting" is not "wait"
+    _INTERRUPT_RE = re.compile(
+        r"\b(?:" + "|".join(INTERRUPT_KEYWORDS) + r")\b", re.IGNORECASE
+    )
 
     def __init__(
         self,
@@ -117,8 +155,13 @@ class FastWhisperTranscriber:
         )
 
         self._model = None
+        self._batched = None  # BatchedInferencePipeline, False if unavailable
         self._running = False
-        self._audio_queue = queue.Queue()
+        # Written from the audio callback at ~31 Hz; SimpleQueue skips the
+        # Condition bookkeeping of queue.Queue
+        self._audio_queue: "queue.SimpleQueue[np.ndarray]" = queue.SimpleQueue()
+        # (segment, muted when it ended), transcribed off the VAD thread
+        self._speech_queue: "queue.Queue[Tuple[SpeechSegment, bool]]" = queue.Queue()
         self._muted = False
         self._mute_lock = threading.Lock()
 
@@ -127,67 +170,155 @@ class FastWhisperTranscriber:
             self._model = get_model(self.model_size)
         return self._model
 
+    def _get_batched(self):
+        """BatchedInferencePipeline over the model, or None if unavailable."""
+        if self._batched is None:
+            try:
+                from faster_whisper import BatchedInferencePipeline
+
+                self._batched = BatchedInferencePipeline(model=self._get_model())
+            except ImportError:
+                self._batched = False
+        return self._batched or None
+
+    def warmup(self):
+        """
+        Load the VAD and Whisper models and run each a few times on silence.
+
+        Otherwise both load lazily and the first utterance waits seconds for
+        them; the first runs after loading are also slower than steady state.
+        """
+        self.vad.warmup()
+        model = self._get_model()
+        silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        for _ in range(2):
+            parts, _ = model.transcribe(
+                silence, language="en", beam_size=1, best_of=1, vad_filter=False
+            )
+            list(parts)  # transcribe() is lazy until its segments are consumed
+
     def _handle_speech(self, segment: SpeechSegment):
-        """Process a speech segment."""
-        try:
-            with self._mute_lock:
-                is_muted = self._muted
+        """Queue a speech segment for transcription."""
+        with self._mute_lock:
+            is_muted = self._muted
+        self._speech_queue.put((segment, is_muted))
 
-            model = self._get_model()
+    def _transcribe_loop(self):
+        """Transcribe queued speech, batching segments that arrived together."""
+        while self._running:
+            try:
+                batch = [self._speech_queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            while len(batch) < MAX_BATCH_SEGMENTS:
+                try:
+                    batch.append(self._speech_queue.get_nowait())
+                except queue.Empty:
+                    break
 
-            t0 = time.time()
-            segments, info = model.transcribe(
+            try:
+                t0 = time.time()
+                texts = self._transcribe([segment for segment, _ in batch])
+                inference_ms = int((time.time() - t0) * 1000)
+            except Exception as e:
+                print(f"Speech handling error: {e}", file=sys.stderr)
+                continue
+
+            for (_, is_muted), (text, language) in zip(batch, texts):
+                self._deliver(text, language, inference_ms, is_muted)
+
+    def _transcribe(self, segments: List[SpeechSegment]) -> List[Tuple[str, str]]:
+        """Transcribe segments, returning (text, language) for each."""
+        if len(segments) > 1:
+            batched = self._get_batched()
+            if batched is not None:
+                try:
+                    return self._transcribe_batched(batched, segments)
+                except Exception as e:
+                    print(
+                        f"Batched transcription failed, falling back: {e}",
+                        file=sys.stderr,
+                    )
+
+        model = self._get_model()
+        results = []
+        for segment in segments:
+            parts, info = model.transcribe(
                 segment.audio,
                 language="en",
                 beam_size=1,
                 best_of=1,
                 vad_filter=False,
             )
+            text = " ".join(part.text for part in parts).strip()
+            results.append((text, info.language or "en"))
+        return results
+
+    def _transcribe_batched(
+        self, batched, segments: List[SpeechSegment]
+    ) -> List[Tuple[str, str]]:
+        """Transcribe several segments in one batched pass over their concatenation."""
+        # Each segment is one clip (in samples) of the concatenated audio
+        clips = []
+        offset = 0
+        for segment in segments:
+            clips.append({"start": offset, "end": offset + len(segment.audio)})
+            offset += len(segment.audio)
+        starts = [clip["start"] / SAMPLE_RATE for clip in clips]
+
+        parts, info = batched.transcribe(
+            np.concatenate([segment.audio for segment in segments]),
+            language="en",
+            beam_size=1,
+            batch_size=len(segments),
+            vad_filter=False,
+            clip_timestamps=clips,
+        )
 
-            text_parts = []
-            for seg in segments:
-                text_parts.append(seg.text)
+        # Map each output segment back to the clip it starts in
+        texts: List[List[str]] = [[] for _ in segments]
+        for part in parts:
+            index = max(bisect.bisect_right(starts, part.start + 1e-3) - 1, 0)
+            texts[index].append(part.text)
 
-            text = " ".join(text_parts).strip()
-            inference_ms = int((time.time() - t0) * 1000)
+        language = info.language or "en"
+        return [(" ".join(t).strip(), language) for t in texts]
 
-            if not text:
-                return
+    def _deliver(self, text: str, language: str, inference_ms: int, is_muted: bool):
+        """Filter a transcription and pass it to the callbacks."""
+        if not text:
+            return
 
-            if is_hallucination(text):
-                print(f"Filtered hallucination: '{text[:50]}'", file=sys.stderr)
-                return
+        if is_hallucination(text):
+            print(f"Filtered hallucination: '{text[:50]}'", file=sys.stderr)
+            return
 
-            is_interrupt = self._is_interrupt(text)
-            if is_interrupt and self.on_interrupt:
-                try:
-                    self.on_interrupt(text)
-                except Exception as e:
-                    print(f"Interrupt callback error: {e}", file=sys.stderr)
-
-            if is_muted:
-                return
+        is_interrupt = self._is_interrupt(text)
+        if is_interrupt and self.on_interrupt:
+            try:
+                self.on_interrupt(text)
+            except Exception as e:
+                print(f"Interrupt callback error: {e}", file=sys.stderr)
 
-            result = TranscriptionResult(
-                text=text,
-                language=info.language or "en",
-                confidence=1.0,
-                duration_ms=inference_ms,
-            )
+        if is_muted:
+            return
 
-            if self.on_transcription:
-                try:
-                    self.on_transcription(result)
-                except Exception as e:
-                    print(f"Transcription callback error: {e}", file=sys.stderr)
+        result = TranscriptionResult(
+            text=text,
+            language=language,
+            confidence=1.0,
+            duration_ms=inference_ms,
+        )
 
-        except Exception as e:
-            print(f"Speech handling error: {e}", file=sys.stderr)
+        if self.on_transcription:
+            try:
+                self.on_transcription(result)
+            except Exception as e:
+                print(f"Transcription callback error: {e}", file=sys.stderr)
 
     def _is_interrupt(self, text: str) -> bool:
         """Check if text contains interrupt keyword."""
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in self.INTERRUPT_KEYWORDS)
+        return self._INTERRUPT_RE.search(text) is not None
 
     def mute(self):
         """Mute transcriptions (still detect interrupts)."""
@@ -215,7 +346,7 @@ class FastWhisperTranscriber:
             def audio_callback(indata, frames, time_info, status):
                 if status:
                     print(f"Audio status: {status}", file=sys.stderr)
-                self._audio_queue.put(indata.copy().flatten())
+                self._audio_queue.put(indata[:, 0].copy())
 
             self._stream = sd.InputStream(
                 samplerate=SAMPLE_RATE,
@@ -231,6 +362,11 @@ class FastWhisperTranscriber:
             )
             self._process_thread.start()
 
+            self._transcribe_thread = threading.Thread(
+                target=self._transcribe_loop, daemon=True
+            )
+            self._transcribe_thread.start()
+
             print("Fast Whisper transcriber started", file=sys.stderr)
             return True
 
@@ -250,12 +386,20 @@ class FastWhisperTranscriber:
         """Main processing loop."""
         while self._running:
             try:
-                audio_chunk = self._audio_queue.get(timeout=0.1)
+                chunks = [self._audio_queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            # Catch up on everything that queued meanwhile (e.g. after a GC
+            # pause) in one pass rather than one blocking get per chunk
+            while True:
+                try:
+                    chunks.append(self._audio_queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
                 with self._mute_lock:
                     if self._muted:
                         continue
-                self.vad.process_chunk(audio_chunk)
-            except queue.Empty:
-                continue
+                self.vad.process_chunks(chunks)
             except Exception as e:
                 print(f"Process loop error: {e}", file=sys.stderr)
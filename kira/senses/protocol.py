@@ -5,14 +5,32 @@ All communication happens over JSON lines on stdin/stdout.
 This protocol is versioned and should remain backwards compatible.
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional, Any, Union
 import json
+import os
 import sys
+import threading
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PROTOCOL_VERSION = "1.0"
 
+# Per-command tracing via debug() is only written when KIRA_SENSE_DEBUG=1
+DEBUG = os.getenv("KIRA_SENSE_DEBUG") == "1"
+
+# Messages are written straight to the stdout descriptor, skipping the text
+# and buffer layers of sys.stdout; None if stdout has no descriptor
+try:
+    _STDOUT_FD: Optional[int] = sys.stdout.fileno()
+except (AttributeError, OSError, ValueError):
+    _STDOUT_FD = None
+_emit_lock = threading.Lock()
+
 # Default priorities for signal types
 PRIORITY_VOICE = 100  # User spoke - highest priority
 PRIORITY_INTERRUPT = 90  # User wants to interrupt
@@ -36,8 +54,22 @@ class Signal:
     metadata: dict = field(default_factory=dict)  # Sense-specific data
     timestamp: float = field(default_factory=time.time)
 
+    def to_dict(self) -> dict:
+        # Built by hand: asdict() would deep-copy metadata on every emit
+        return {
+            "type": "signal",
+            "sense": self.sense,
+            "content": self.content,
+            "priority": self.priority,
+            "metadata": self.metadata,
+            "timestamp": self.timestamp,
+        }
+
     def to_json(self) -> str:
-        return json.dumps({"type": "signal", **asdict(self)})
+        return json.dumps(self.to_dict())
+
+    def to_bytes(self) -> bytes:
+        return _dumps(self.to_dict())
 
 
 @dataclass
@@ -53,8 +85,20 @@ class Status:
     message: str = ""  # Optional details
     timestamp: float = field(default_factory=time.time)
 
+    def to_dict(self) -> dict:
+        return {
+            "type": "status",
+            "sense": self.sense,
+            "status": self.status,
+            "message": self.message,
+            "timestamp": self.timestamp,
+        }
+
     def to_json(self) -> str:
-        return json.dumps({"type": "status", **asdict(self)})
+        return json.dumps(self.to_dict())
+
+    def to_bytes(self) -> bytes:
+        return _dumps(self.to_dict())
 
 
 @dataclass
@@ -70,10 +114,10 @@ class Command:
     options: dict = field(default_factory=dict)  # Command-specific options
 
     @classmethod
-    def from_json(cls, line: str) -> Optional["Command"]:
+    def from_json(cls, line: Union[str, bytes]) -> Optional["Command"]:
         """Parse a JSON line into a Command, or None if invalid."""
         try:
-            data = json.loads(line)
+            data = _loads(line)
             if data.get("type") == "command" or "command" in data:
                 return cls(command=data["command"], options=data.get("options", {}))
         except (json.JSONDecodeError, KeyError):
@@ -81,9 +125,37 @@ class Command:
         return None
 
 
+def _loads(line: Union[str, bytes]) -> Any:
+    """Parse JSON, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _dumps(payload: dict) -> bytes:
+    """Encode a message as JSON bytes, with orjson when it's installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass  # Something only the json module's encoder handles
+    return json.dumps(payload).encode()
+
+
 def emit(message: Union[Signal, Status]) -> None:
     """Send a message to core via stdout."""
-    print(message.to_json(), flush=True)
+    data = message.to_bytes() + b"\n"
+    if _STDOUT_FD is None:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+        return
+
+    # Unbuffered, so there's nothing to flush. A message longer than PIPE_BUF
+    # can take several writes; the lock keeps other threads' lines out of it.
+    view = memoryview(data)
+    with _emit_lock:
+        while view:
+            view = view[os.write(_STDOUT_FD, view) :]
 
 
 def emit_signal(sense: str, content: str, priority: int, **metadata) -> None:
@@ -106,9 +178,22 @@ def emit_error(sense: str, message: str) -> None:
     emit_status(sense, "error", message)
 
 
-def log(message: str) -> None:
-    """Log to stderr (doesn't interfere with protocol on stdout)."""
-    print(message, file=sys.stderr, flush=True)
+def log(message: str, *args: Any) -> None:
+    """Log to stderr (doesn't interfere with protocol on stdout).
+
+    If args are given, message is %-formatted with them.
+    """
+    print(message % args if args else message, file=sys.stderr, flush=True)
+
+
+def debug(message: str, *args: Any) -> None:
+    """Log like log(), but only with KIRA_SENSE_DEBUG=1.
+
+    Pass values as args rather than an f-string so nothing is formatted
+    when debug output is off.
+    """
+    if DEBUG:
+        log(message, *args)
 
 
 def read_commands():
@@ -121,7 +206,8 @@ def read_commands():
                 break
             handle(cmd)
     """
-    for line in sys.stdin:
+    # Raw bytes lines: the JSON parser takes them without a str decode
+    for line in sys.stdin.buffer:
         line = line.strip()
         if not line:
             continue
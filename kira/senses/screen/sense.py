@@ -13,8 +13,8 @@ import sys
 import os
 import time
 import threading
-import hashlib
 from typing import Optional
+import cv2
 import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,6 +22,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from base import BaseSense
 from protocol import PRIORITY_SCREEN, log
 
+# Captures are compared as grayscale thumbnails of this size (width, height)
+COMPARE_SIZE = (192, 108)
+
+# Grayscale difference above which a thumbnail pixel counts as changed; below
+# it is compression noise, subpixel rendering and the like
+PIXEL_DIFF_THRESHOLD = 20
+
 
 class ScreenSense(BaseSense):
     """
@@ -31,6 +38,10 @@ class ScreenSense(BaseSense):
         hz: Capture frequency (default: 0.5 - every 2 seconds)
         monitor: Monitor index to capture (default: 0 - primary)
         change_threshold: How different screen must be to trigger analysis (0-1)
+
+    Like every sense this runs in its own process, so it loads its own copy
+    of the Moondream weights; running it next to the vision sense needs
+    memory for two models.
     """
 
     name = "screen"
@@ -40,12 +51,17 @@ class ScreenSense(BaseSense):
         super().__init__()
         self._thread: Optional[threading.Thread] = None
         self._vlm = None
-        self._last_hash: Optional[str] = None
+        # Grayscale thumbnail of the last analyzed capture, plus scratch
+        # buffers reused across captures
+        self._last_small: Optional[np.ndarray] = None
+        self._small: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._sct = None  # mss instance, owned by the capture thread
 
         self._config = {
             "hz": 0.5,  # Every 2 seconds
             "monitor": 0,  # Primary monitor
-            "change_threshold": 0.1,  # 10% pixel change to trigger
+            "change_threshold": 0.1,  # Fraction of pixels that must change
         }
 
     def _initialize(self):
@@ -92,8 +108,8 @@ class ScreenSense(BaseSense):
                     time.sleep(sleep_time)
                     continue
 
-                # Analyze the screen
-                result = self._analyze(screenshot)
+                # Analyze the screen; only now is the full frame converted
+                result = self._analyze(np.ascontiguousarray(screenshot[:, :, 2::-1]))
                 if result:
                     self._emit_observation(result)
 
@@ -104,26 +120,36 @@ class ScreenSense(BaseSense):
             sleep_time = max(0, interval - elapsed)
             time.sleep(sleep_time)
 
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+
     def _capture_screen(self) -> Optional[np.ndarray]:
-        """Capture screenshot. Returns RGB numpy array."""
+        """Capture screenshot. Returns a BGRA numpy array view of the capture."""
         try:
-            # Use mss for cross-platform screen capture
-            import mss
-
-            with mss.mss() as sct:
-                monitors = sct.monitors
-                if self._config["monitor"] >= len(monitors):
-                    monitor = monitors[1]  # Primary monitor (0 is "all")
-                else:
-                    monitor = monitors[self._config["monitor"] + 1]
-
-                screenshot = sct.grab(monitor)
-
-                # Convert to numpy RGB
-                img = np.array(screenshot)
-                # mss returns BGRA, convert to RGB
-                rgb = img[:, :, :3][:, :, ::-1]
-                return rgb
+            # Use mss for cross-platform screen capture. One instance is
+            # kept for the capture thread rather than reconnecting to the
+            # display server on every grab
+            if self._sct is None:
+                import mss
+
+                self._sct = mss.mss()
+            sct = self._sct
+
+            monitors = sct.monitors
+            if self._config["monitor"] >= len(monitors):
+                monitor = monitors[1]  # Primary monitor (0 is "all")
+            else:
+                monitor = monitors[self._config["monitor"] + 1]
+
+            screenshot = sct.grab(monitor)
+
+            # mss returns BGRA; view its buffer without copying. Most
+            # captures are unchanged and only ever hashed, so the RGB
+            # copy is left to the caller
+            return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+                screenshot.height, screenshot.width, 4
+            )
 
         except ImportError:
             log(f"[{self.name}] mss not installed. Run: pip install mss")
@@ -134,18 +160,26 @@ class ScreenSense(BaseSense):
 
     def _screen_changed(self, screenshot: np.ndarray) -> bool:
         """Check if screen changed significantly from last capture."""
-        # Simple hash-based change detection
-        # Downsample heavily for fast comparison
-        small = screenshot[::20, ::20, :]
-        current_hash = hashlib.md5(small.tobytes()).hexdigest()
+        # Compare area-averaged thumbnails, so a moved cursor or blinking
+        # caret changes a handful of pixels at most
+        thumb = cv2.resize(screenshot, COMPARE_SIZE, interpolation=cv2.INTER_AREA)
+        self._small = cv2.cvtColor(thumb, cv2.COLOR_BGRA2GRAY, dst=self._small)
 
-        if self._last_hash is None:
-            self._last_hash = current_hash
+        if self._last_small is None:
+            self._last_small, self._small = self._small, None
             return True
 
-        changed = current_hash != self._last_hash
-        self._last_hash = current_hash
-        return changed
+        self._diff = cv2.absdiff(self._small, self._last_small, dst=self._diff)
+        cv2.threshold(
+            self._diff, PIXEL_DIFF_THRESHOLD, 255, cv2.THRESH_BINARY, dst=self._diff
+        )
+        changed = cv2.countNonZero(self._diff)
+        if changed <= self._config["change_threshold"] * self._diff.size:
+            return False
+
+        # Only move the reference on a change, so slow drift still adds up
+        self._last_small, self._small = self._small, self._last_small
+        return True
 
     def _analyze(self, screenshot: np.ndarray) -> Optional[dict]:
         """Analyze screenshot with VLM."""
@@ -8,12 +8,15 @@ To swap this for a different VLM, create a new module that exports
 FastVLM and HybridVLM classes with the same interface.
 """
 
+import os
+import re
 import sys
 import time
 import threading
+import cv2
 import numpy as np
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from PIL import Image
 
 _model = None
@@ -33,6 +36,15 @@ class FastVLMResult:
     inference_ms: int
 
 
+def _cpu_has_bf16(torch) -> bool:
+    """Whether the CPU has native bf16 matmul instructions (AVX512-BF16 or AMX)."""
+    for name in ("_is_avx512_bf16_supported", "_is_amx_tile_supported"):
+        check = getattr(torch.cpu, name, None)
+        if check is not None and check():
+            return True
+    return False
+
+
 def get_model():
     """Lazy load Moondream model optimized for speed."""
     global _model, _tokenizer
@@ -47,23 +59,81 @@ def get_model():
                 revision = "2025-01-09"
 
                 device = "mps" if torch.backends.mps.is_available() else "cpu"
-                dtype = torch.float16 if device == "mps" else torch.float32
-
-                _tokenizer = AutoTokenizer.from_pretrained(
+                if device == "mps":
+                    dtype = torch.float16
+                elif os.getenv("KIRA_QUANTIZE") != "1" and _cpu_has_bf16(torch):
+                    # Half the weight bytes of fp32 with the same exponent range
+                    # (int8 quantization needs fp32 weights, so not with that)
+                    dtype = torch.bfloat16
+                else:
+                    dtype = torch.float32
+
+                tokenizer = AutoTokenizer.from_pretrained(
                     model_id, revision=revision, local_files_only=True
                 )
-                _model = AutoModelForCausalLM.from_pretrained(
+                model = AutoModelForCausalLM.from_pretrained(
                     model_id,
                     revision=revision,
                     trust_remote_code=True,
                     torch_dtype=dtype,
                     local_files_only=True,
                 ).to(device)
+                model.eval()
+
+                # Optional int8 dynamic quantization of the Linear layers for
+                # CPU runs: a quarter of the fp32 weight bytes to stream per
+                # token (MPS has no qint8 kernels)
+                if os.getenv("KIRA_QUANTIZE") == "1" and device == "cpu":
+                    model = torch.ao.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    print("Moondream2 quantized to int8", file=sys.stderr)
+
+                # Frames are resized to one fixed size, so the vision encoder
+                # only ever sees one shape and can be compiled for it. Warm up
+                # at that shape so the first real frame doesn't pay for it.
+                if os.getenv("KIRA_COMPILE") == "1" and hasattr(
+                    model, "vision_encoder"
+                ):
+                    model.vision_encoder.forward = torch.compile(
+                        model.vision_encoder.forward,
+                        mode="reduce-overhead",
+                        fullgraph=False,
+                        dynamic=False,
+                    )
+                    with torch.inference_mode():
+                        model.encode_image(Image.new("RGB", OPTIMAL_SIZE))
+                    print("Moondream2 vision encoder compiled", file=sys.stderr)
+
+                # Publish only once fully prepared: the unlocked check above
+                # must never hand out a half-initialized model
+                _tokenizer = tokenizer
+                _model = model
 
                 print(f"Moondream2 loaded on {device} (fast mode)", file=sys.stderr)
     return _model, _tokenizer
 
 
+def _preload_model():
+    """Load the model on a daemon thread so the first analyze() doesn't pay for it."""
+
+    def load():
+        try:
+            get_model()
+        except Exception as e:
+            print(f"FastVLM preload failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=load, daemon=True).start()
+
+
+def dhash(frame: np.ndarray) -> int:
+    """64-bit difference hash of an RGB frame, from a 9x8 grayscale thumbnail."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
 class FastVLM:
     """
     Fast Vision-Language Model for real-time scene understanding.
@@ -81,9 +151,55 @@ class FastVLM:
     )
     EMOTION_PROMPT = "Person emotion in 1 word:"
 
-    def __init__(self, target_size: Tuple[int, int] = OPTIMAL_SIZE):
+    EMOTIONS = [
+        "happy",
+        "sad",
+        "angry",
+        "surprised",
+        "fearful",
+        "disgusted",
+        "neutral",
+        "calm",
+        "excited",
+        "confused",
+        "tired",
+        "focused",
+        "joyful",
+        "anxious",
+        "relaxed",
+        "bored",
+        "curious",
+    ]
+    # One whole-word, case-insensitive pass instead of a scan per emotion
+    _EMOTION_RE = re.compile(r"\b(" + "|".join(EMOTIONS) + r")\b", re.IGNORECASE)
+
+    # Reuse the previous image encoding while the 32x32 grayscale thumbnail
+    # stays within this mean absolute difference (0-255 scale), for at most
+    # CACHE_MAX_AGE seconds: an expression change barely moves the thumbnail,
+    # so a still face has to be re-encoded now and then to be re-read
+    CACHE_THUMB_SIZE = (32, 32)
+    CACHE_MAX_THUMB_DIFF = 4.0
+    CACHE_MAX_AGE = 2.0
+
+    def __init__(
+        self, target_size: Tuple[int, int] = OPTIMAL_SIZE, prewarm: bool = True
+    ):
         self.target_size = target_size
         self._last_result: Optional[FastVLMResult] = None
+        # Last image encoding and the thumbnail of the frame it came from
+        self._cached_encoding = None
+        self._cache_thumb: Optional[np.ndarray] = None
+        self._cache_target_size = target_size
+        self._cache_time = 0.0
+        # Resize destination and the PIL image it's copied into, reused for
+        # every frame and reallocated only if target_size changes
+        self._scratch: Optional[np.ndarray] = None
+        self._pil_img: Optional[Image.Image] = None
+
+        # Start loading the model now; analyze() waits on the same lock if
+        # it's not done
+        if prewarm:
+            _preload_model()
 
     def analyze(
         self, frame: np.ndarray, include_activity: bool = True
@@ -99,15 +215,9 @@ class FastVLM:
             FastVLMResult with emotion, activity, and summary
         """
         try:
-            import cv2
-
             t0 = time.time()
 
-            small = cv2.resize(frame, self.target_size)
-            pil_img = Image.fromarray(small)
-
-            model, tokenizer = get_model()
-            enc = model.encode_image(pil_img)
+            model, tokenizer, enc = self._encode(frame)
 
             if include_activity:
                 response = model.answer_question(enc, self.FAST_PROMPT, tokenizer)
@@ -136,6 +246,80 @@ class FastVLM:
             print(f"FastVLM error: {e}", file=sys.stderr)
             return None
 
+    def analyze_batched(
+        self, frame: np.ndarray, prompts: List[str]
+    ) -> Optional[List[str]]:
+        """
+        Answer several prompts about one frame, encoding the image only once.
+
+        Every answer starts from the same encoding, which carries the image
+        prefix's KV cache, so only the prompt and answer tokens run per prompt.
+
+        Returns:
+            One answer per prompt, or None on error.
+        """
+        try:
+            model, tokenizer, enc = self._encode(frame)
+            return [model.answer_question(enc, p, tokenizer) for p in prompts]
+        except Exception as e:
+            print(f"FastVLM error: {e}", file=sys.stderr)
+            return None
+
+    def _encode(self, frame: np.ndarray):
+        """Downscale and encode frame, returning (model, tokenizer, encoding)."""
+        size = tuple(self.target_size)
+        if self._pil_img is None or self._pil_img.size != size:
+            self._scratch = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            self._pil_img = Image.new("RGB", size)
+
+        # Area averaging is OpenCV's fast, alias-free downscale. PIL stores
+        # RGB padded to 4 bytes a pixel, so it can't share the array's memory;
+        # the pixels are copied into the existing image instead of a new one.
+        small = cv2.resize(
+            np.ascontiguousarray(frame, dtype=np.uint8),
+            size,
+            dst=self._scratch,
+            interpolation=cv2.INTER_AREA,
+        )
+        pil_img = self._pil_img
+        pil_img.frombytes(small)
+
+        model, tokenizer = get_model()
+
+        # Encode image, unless the scene hasn't changed since the last one.
+        # The encoding holds the image-prefix KV cache, so a hit also
+        # skips re-running the text model over the image tokens.
+        thumb = cv2.resize(
+            cv2.cvtColor(small, cv2.COLOR_RGB2GRAY),
+            self.CACHE_THUMB_SIZE,
+            interpolation=cv2.INTER_AREA,
+        )
+        enc = self._cached_encoding_for(thumb)
+        if enc is None:
+            enc = model.encode_image(pil_img)
+            self._store_encoding(thumb, enc)
+        return model, tokenizer, enc
+
+    def _cached_encoding_for(self, thumb: np.ndarray):
+        """Return the cached encoding if thumb matches the last encoded frame."""
+        if (
+            self._cached_encoding is None
+            or self._cache_target_size != self.target_size
+            or time.time() - self._cache_time >= self.CACHE_MAX_AGE
+        ):
+            return None
+        diff = np.abs(thumb.astype(np.int16) - self._cache_thumb).mean()
+        if diff < self.CACHE_MAX_THUMB_DIFF:
+            return self._cached_encoding
+        return None
+
+    def _store_encoding(self, thumb: np.ndarray, enc):
+        """Remember enc as the encoding of the frame that produced thumb."""
+        self._cached_encoding = enc
+        self._cache_thumb = thumb.astype(np.int16)
+        self._cache_target_size = self.target_size
+        self._cache_time = time.time()
+
     def quick_emotion(self, frame: np.ndarray) -> Tuple[str, int]:
         """Ultra-fast emotion-only detection."""
         result = self.analyze(frame, include_activity=False)
@@ -144,34 +328,9 @@ class FastVLM:
         return "unknown", 0
 
     def _extract_emotion(self, text: str) -> str:
-        """Extract emotion keyword from response."""
-        text_lower = text.lower()
-
-        emotions = [
-            "happy",
-            "sad",
-            "angry",
-            "surprised",
-            "fearful",
-            "disgusted",
-            "neutral",
-            "calm",
-            "excited",
-            "confused",
-            "tired",
-            "focused",
-            "joyful",
-            "anxious",
-            "relaxed",
-            "bored",
-            "curious",
-        ]
-
-        for emotion in emotions:
-            if emotion in text_lower:
-                return emotion
-
-        return "neutral"
+        """Extract the first emotion keyword mentioned in the response."""
+        match = self._EMOTION_RE.search(text)
+        return match.group(1).lower() if match else "neutral"
 
 
 class HybridVLM:
@@ -180,28 +339,55 @@ class HybridVLM:
 
     - Every frame: Fast emotion detection (~400ms)
     - Every N frames: Full scene description (~1500ms)
+    - Static scene: the last result again, without running the VLM, for at
+      most STATIC_MAX_AGE seconds
     """
 
+    # Frames whose dHash differs from the last analyzed frame's in fewer bits
+    # than this count as the same scene
+    STATIC_MAX_DISTANCE = 6
+
+    # Seconds a result may be reused for a static scene; someone sitting still
+    # looks static, so the emotion is still re-read this often. Longer than
+    # FastVLM.CACHE_MAX_AGE, so the re-read gets a fresh image encoding.
+    STATIC_MAX_AGE = 5.0
+
     def __init__(self, full_analysis_interval: int = 30):
         self.fast_vlm = FastVLM()
         self.full_analysis_interval = full_analysis_interval
         self._frame_count = 0
         self._last_full_analysis: Optional[str] = None
+        self._last_hash: Optional[int] = None  # dHash of the last analyzed frame
+        self._last_result: Optional[dict] = None
+        self._last_result_time = 0.0
 
     def analyze(self, frame: np.ndarray) -> dict:
         """
         Analyze frame with hybrid approach.
 
         Returns dict with:
-        - emotion: Current emotion (always fresh)
+        - emotion: Current emotion (at most STATIC_MAX_AGE seconds old)
         - activity: Activity description (may be cached)
         - is_full_analysis: Whether this was a full analysis
         - inference_ms: Time taken
         """
+        # Skipped frames count too, so full analyses stay on schedule
         self._frame_count += 1
         do_full = self._frame_count % self.full_analysis_interval == 0
 
-        result = self.fast_vlm.analyze(frame, include_activity=do_full)
+        frame_hash = dhash(frame)
+        if (
+            not do_full
+            and self._last_result is not None
+            and time.time() - self._last_result_time < self.STATIC_MAX_AGE
+            and (frame_hash ^ self._last_hash).bit_count() < self.STATIC_MAX_DISTANCE
+        ):
+            return {**self._last_result, "is_full_analysis": False, "inference_ms": 0}
+
+        if do_full:
+            result = self._analyze_full(frame)
+        else:
+            result = self.fast_vlm.analyze(frame, include_activity=False)
 
         if result is None:
             return {
@@ -214,7 +400,9 @@ class HybridVLM:
         if do_full:
             self._last_full_analysis = result.activity
 
-        return {
+        self._last_hash = frame_hash
+        self._last_result_time = time.time()
+        self._last_result = {
             "emotion": result.emotion,
             "activity": result.activity
             if do_full
@@ -222,3 +410,20 @@ class HybridVLM:
             "is_full_analysis": do_full,
             "inference_ms": result.inference_ms,
         }
+        return self._last_result
+
+    def _analyze_full(self, frame: np.ndarray) -> Optional[FastVLMResult]:
+        """Ask for the emotion and the activity, sharing one image encoding."""
+        t0 = time.time()
+        answers = self.fast_vlm.analyze_batched(
+            frame, [FastVLM.EMOTION_PROMPT, FastVLM.FAST_PROMPT]
+        )
+        if answers is None:
+            return None
+        emotion, activity = answers[0].strip(), answers[1]
+        return FastVLMResult(
+            emotion=emotion,
+            activity=activity,
+            summary=activity,
+            inference_ms=int((time.time() - t0) * 1000),
+        )
@@ -52,4 +52,5 @@ class VoiceOutput(BaseOutput):
     def _cleanup(self):
         """Release resources."""
         if self._tts:
-            self._tts.interrupt()
+            # Swapped-in TTS classes only have to provide speak/interrupt
+            getattr(self._tts, "close", self._tts.interrupt)()
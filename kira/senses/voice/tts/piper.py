@@ -10,8 +10,6 @@ that exports a class with the same interface as PiperTTS.
 
 import sys
 import os
-import subprocess
-import tempfile
 import threading
 import queue
 from typing import Optional
@@ -20,10 +18,18 @@ DEFAULT_VOICE_PATH = os.path.expanduser(
     "~/.local/share/piper-voices/en_US-amy-medium.onnx"
 )
 
+DEFAULT_SAMPLE_RATE = 22050  # Piper's usual rate, for chunks that don't say
+
 _voice = None
 _voice_lock = threading.Lock()
 
 
+def _quantized_path(model_path: str) -> str:
+    """Path of the int8 variant of a voice: voice.onnx -> voice.int8.onnx."""
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.int8{ext}"
+
+
 def get_voice(model_path: str = DEFAULT_VOICE_PATH):
     """Lazy load Piper voice model."""
     global _voice
@@ -33,7 +39,16 @@ def get_voice(model_path: str = DEFAULT_VOICE_PATH):
                 print(f"Loading Piper voice...", file=sys.stderr)
                 from piper import PiperVoice
 
-                _voice = PiperVoice.load(model_path)
+                # An int8-quantized copy of the voice next to it (made with
+                # onnxruntime's quantize_dynamic) is used when present; it
+                # shares the original's config
+                quantized = _quantized_path(model_path)
+                if os.path.exists(quantized):
+                    _voice = PiperVoice.load(
+                        quantized, config_path=f"{model_path}.json"
+                    )
+                else:
+                    _voice = PiperVoice.load(model_path)
                 print(
                     f"Piper loaded (sample rate: {_voice.config.sample_rate}Hz)",
                     file=sys.stderr,
@@ -41,84 +56,76 @@ def get_voice(model_path: str = DEFAULT_VOICE_PATH):
     return _voice
 
 
+def _preload_voice(model_path: str):
+    """Load the voice on a daemon thread so the first speak() doesn't pay for it."""
+
+    def load():
+        try:
+            get_voice(model_path)
+        except Exception as e:
+            print(f"Piper preload failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=load, daemon=True).start()
+
+
 class PiperTTS:
     """
     Fast text-to-speech using Piper.
 
     Target: <100ms generation for typical sentences.
+
+    Audio goes to one sounddevice output stream that stays open between
+    utterances, and each synthesized chunk is written to it as soon as Piper
+    produces it: no temp files or player processes per utterance, and
+    playback starts after the first sentence rather than the whole text.
     """
 
-    def __init__(self, voice_path: Optional[str] = None):
+    def __init__(self, voice_path: Optional[str] = None, prewarm: bool = True):
         self.voice_path = voice_path or DEFAULT_VOICE_PATH
-        self._audio_queue: queue.Queue = queue.Queue()
+        self._text_queue: queue.Queue = queue.Queue()
         self._playback_thread: Optional[threading.Thread] = None
-        self._playback_process: Optional[subprocess.Popen] = None
-        self._playback_lock = threading.Lock()
-        self._interrupted = False
-
-    def speak(self, text: str, blocking: bool = True) -> Optional[str]:
+        self._stream = None  # sounddevice RawOutputStream, opened lazily
+        self._sample_rate: Optional[int] = None
+        self._playback_lock = threading.Lock()  # Guards the stream
+        self._speak_lock = threading.Lock()  # One utterance at a time
+        self._generation = 0  # Bumped by interrupt() to cancel queued speech
+        self._speaking = False
+
+        # Start loading the voice now; speak() waits on the same lock if it's
+        # not done
+        if prewarm:
+            _preload_voice(self.voice_path)
+
+    def speak(self, text: str, blocking: bool = True) -> None:
         """
         Convert text to speech and play it.
 
         Args:
             text: Text to speak
-            blocking: If True, wait for audio to finish
-
-        Returns:
-            Path to generated audio file (if not blocking)
+            blocking: If True, wait for audio to finish; otherwise queue it
         """
         if not text or not text.strip():
-            return None
-
-        self._interrupted = False
-        voice = get_voice(self.voice_path)
-
-        audio_bytes = b""
-        sample_rate = 22050  # Default Piper sample rate
-        for chunk in voice.synthesize(text):
-            audio_bytes += chunk.audio_int16_bytes
-            if chunk.sample_rate:
-                sample_rate = chunk.sample_rate
-
-        if not audio_bytes:
-            return None
-
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            import wave
-
-            with wave.open(f.name, "wb") as wav:
-                wav.setnchannels(1)
-                wav.setsampwidth(2)
-                wav.setframerate(sample_rate)
-                wav.writeframes(audio_bytes)
-            audio_path = f.name
+            return
 
         if blocking:
-            self._play_audio(audio_path)
-            return None
+            self._speak(text, self._generation)
         else:
-            self._audio_queue.put(audio_path)
+            self._text_queue.put((text, self._generation))
             self._ensure_playback_thread()
-            return audio_path
 
     def interrupt(self):
         """Stop current playback immediately."""
-        self._interrupted = True
-
         with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
+            self._generation += 1
+            if self._stream is not None and self._stream.active:
                 try:
-                    self._playback_process.terminate()
-                    self._playback_process.wait(timeout=0.5)
+                    self._stream.abort()
                 except Exception:
-                    try:
-                        self._playback_process.kill()
-                    except Exception:
-                        pass
+                    pass
 
-        while not self._audio_queue.empty():
+        while not self._text_queue.empty():
             try:
-                self._audio_queue.get_nowait()
+                self._text_queue.get_nowait()
             except queue.Empty:
                 break
 
@@ -126,28 +133,59 @@ class PiperTTS:
 
     def is_speaking(self) -> bool:
         """Check if currently speaking."""
+        return self._speaking or not self._text_queue.empty()
+
+    def close(self):
+        """Stop playback, end the playback thread and release the output stream."""
+        self.interrupt()
+        if self._playback_thread is not None:
+            self._text_queue.put(None)
         with self._playback_lock:
-            if self._playback_process and self._playback_process.poll() is None:
-                return True
-        return not self._audio_queue.empty()
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
 
-    def _play_audio(self, path: str):
-        """Play audio file."""
-        if self._interrupted:
-            return
+    def _speak(self, text: str, generation: int):
+        """Synthesize text and play it chunk by chunk, unless interrupted."""
+        voice = get_voice(self.voice_path)
+
+        with self._speak_lock:
+            if self._generation != generation:
+                return
+            self._speaking = True
+            try:
+                stream = None
+                for chunk in voice.synthesize(text):
+                    if self._generation != generation:
+                        return
+                    stream = self._get_stream(chunk.sample_rate or DEFAULT_SAMPLE_RATE)
+                    stream.write(chunk.audio_int16_bytes)
+
+                # stop() returns once the buffered audio has been played; the
+                # next utterance starts the stream again
+                if stream is not None and self._generation == generation:
+                    stream.stop()
+            except Exception as e:
+                if self._generation == generation:
+                    print(f"Playback error: {e}", file=sys.stderr)
+            finally:
+                self._speaking = False
 
+    def _get_stream(self, sample_rate: int):
+        """Return the started output stream, (re)opening it for sample_rate."""
         with self._playback_lock:
-            self._playback_process = subprocess.Popen(
-                ["afplay", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-            )
+            if self._stream is None or self._sample_rate != sample_rate:
+                import sounddevice as sd
 
-        try:
-            self._playback_process.wait()
-        except Exception:
-            pass
-        finally:
-            with self._playback_lock:
-                self._playback_process = None
+                if self._stream is not None:
+                    self._stream.close()
+                self._stream = sd.RawOutputStream(
+                    samplerate=sample_rate, channels=1, dtype="int16"
+                )
+                self._sample_rate = sample_rate
+            if not self._stream.active:
+                self._stream.start()
+            return self._stream
 
     def _ensure_playback_thread(self):
         """Ensure background playback thread is running."""
@@ -160,15 +198,12 @@ class PiperTTS:
     def _playback_loop(self):
         """Background thread for non-blocking playback."""
         while True:
+            # Sleeps until there's something to say; None is close()'s
+            # signal to exit
+            item = self._text_queue.get()
+            if item is None:
+                return
             try:
-                audio_path = self._audio_queue.get(timeout=1.0)
-                if not self._interrupted:
-                    self._play_audio(audio_path)
-                try:
-                    os.unlink(audio_path)
-                except Exception:
-                    pass
-            except queue.Empty:
-                continue
+                self._speak(*item)
             except Exception as e:
                 print(f"Playback error: {e}", file=sys.stderr)